@@ -0,0 +1,128 @@
+"""
+Compare ASR backends on a local fixture: real-time factor and WER.
+
+Usage:
+    python -m benchmarks.asr_backends \
+        --backends transformers transformers-int8 faster-whisper
+"""
+
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+
+from src.config.settings import Settings
+from src.services.ai.speech_recognition import create_speech_recognition
+from src.services.audio.pcm import SAMPLE_RATE, read_pcm, to_float32
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "asr")
+
+MISSING_FIXTURE = """No clips with references in {fixture_dir}.
+
+The fixture is not committed. Add short Portuguese clips, each next to a
+.txt reference transcript (clip-01.wav + clip-01.txt), for instance from
+the CC0 Mozilla Common Voice dataset, or point --fixture-dir at a folder
+that has them. See benchmarks/fixtures/asr/README.md."""
+
+
+def load_fixture(fixture_dir: str) -> tuple:
+    """Load every clip that has a matching .txt reference."""
+    clips, references = [], []
+
+    if not os.path.isdir(fixture_dir):
+        return clips, references
+
+    for name in sorted(os.listdir(fixture_dir)):
+        stem, extension = os.path.splitext(name)
+        reference_path = os.path.join(fixture_dir, stem + ".txt")
+
+        if extension in (".txt", ".md") or not os.path.exists(reference_path):
+            continue
+
+        clips.append(to_float32(read_pcm(os.path.join(fixture_dir, name))))
+
+        with open(reference_path, "r", encoding="utf-8") as f:
+            references.append(f.read())
+
+    return clips, references
+
+
+def normalize(text: str) -> list:
+    return re.sub(r"[^\w\s]", " ", text.lower()).split()
+
+
+def word_error_rate(references: list, hypotheses: list) -> float:
+    """Corpus WER: word-level edit distance over reference word count."""
+    errors = 0
+    total = 0
+
+    for reference, hypothesis in zip(references, hypotheses):
+        ref, hyp = normalize(reference), normalize(hypothesis)
+        distances = np.arange(len(hyp) + 1)
+
+        for i, ref_word in enumerate(ref, start=1):
+            previous, distances = distances, np.empty_like(distances)
+            distances[0] = i
+
+            for j, hyp_word in enumerate(hyp, start=1):
+                distances[j] = min(
+                    previous[j] + 1,
+                    distances[j - 1] + 1,
+                    previous[j - 1] + (ref_word != hyp_word),
+                )
+
+        errors += distances[-1]
+        total += len(ref)
+
+    return errors / max(total, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=["transformers", "transformers-int8", "faster-whisper"],
+    )
+    parser.add_argument("--model-size", default=None)
+    parser.add_argument("--fixture-dir", default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    clips, references = load_fixture(args.fixture_dir)
+
+    if not clips:
+        raise SystemExit(MISSING_FIXTURE.format(fixture_dir=args.fixture_dir))
+
+    audio_seconds = sum(len(clip) for clip in clips) / SAMPLE_RATE
+    print(f"Fixture: {len(clips)} clips, {audio_seconds:.1f}s of audio")
+
+    for backend in args.backends:
+        settings = Settings()
+        settings.asr_backend = backend
+
+        if args.model_size:
+            settings.asr_model_size = args.model_size
+
+        started = time.perf_counter()
+        recognizer = create_speech_recognition(settings)
+        load_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = recognizer.transcribe(clips)
+        elapsed = time.perf_counter() - started
+
+        # A failed segment counts as an empty hypothesis
+        hypotheses = [r["text"] if r else "" for r in results]
+        wer = word_error_rate(references, hypotheses)
+
+        print(
+            f"{backend:<20} load {load_time:6.1f}s  "
+            f"RTF {elapsed / audio_seconds:6.3f}  "
+            f"WER {wer * 100:5.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
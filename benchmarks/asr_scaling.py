@@ -0,0 +1,88 @@
+"""
+Measure ASR throughput against worker count and threads per worker.
+
+Usage:
+    python -m benchmarks.asr_scaling --workers 1 2 4 --threads 1 2 4 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from src.config.settings import Settings
+from src.services.ai.speech_recognition import (
+    create_local_speech_recognition,
+)
+from src.services.ai.speech_recognition_pool import SpeechRecognitionPool
+from src.services.audio.pcm import SAMPLE_RATE
+
+
+def synthetic_segments(count: int, seed: int = 0) -> list:
+    """1-5 second voiced bursts, the length range VAD merging produces."""
+    rng = np.random.default_rng(seed)
+    segments = []
+
+    for _ in range(count):
+        t = np.arange(int(rng.uniform(1, 5) * SAMPLE_RATE)) / SAMPLE_RATE
+        pitch = rng.uniform(90, 220)
+        burst = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in (1, 2, 3))
+        burst *= 0.5 * (1 + np.sin(2 * np.pi * 4 * t)) * 0.3
+        segments.append(burst.astype(np.float32))
+
+    return segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--segments", type=int, default=64)
+    parser.add_argument("--backend", default=None)
+    parser.add_argument("--model-size", default=None)
+    args = parser.parse_args()
+
+    settings = Settings()
+
+    if args.backend:
+        settings.asr_backend = args.backend
+    if args.model_size:
+        settings.asr_model_size = args.model_size
+
+    segments = synthetic_segments(args.segments)
+    audio_seconds = sum(len(s) for s in segments) / SAMPLE_RATE
+
+    print(
+        f"{settings.asr_backend} ({settings.asr_model_size}), "
+        f"{len(segments)} segments, {audio_seconds:.0f}s of audio"
+    )
+    print(f"{'workers':>7} {'threads':>7} {'seg/s':>8} {'RTF':>7}")
+
+    for workers in args.workers:
+        for threads in args.threads:
+            if workers == 1:
+                torch.set_num_threads(threads)
+                recognizer = create_local_speech_recognition(settings)
+            else:
+                recognizer = SpeechRecognitionPool(settings, workers, threads)
+
+            # Warm-up loads the model(s) outside the measurement
+            recognizer.transcribe(segments[:workers])
+
+            started = time.perf_counter()
+            recognizer.transcribe(segments)
+            elapsed = time.perf_counter() - started
+
+            if workers > 1:
+                recognizer.close()
+
+            print(
+                f"{workers:>7} {threads:>7} "
+                f"{len(segments) / elapsed:>8.2f} "
+                f"{elapsed / audio_seconds:>7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
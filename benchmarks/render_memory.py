@@ -0,0 +1,188 @@
+"""
+Record peak ffmpeg RSS of each render strategy against the number of cuts.
+
+Usage:
+    python -m benchmarks.render_memory --minutes 20 --cuts 10 100 1000 3000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+import numpy as np
+
+from src.config.settings import Settings
+from src.core.timeline import Timeline
+from src.infrastructure.media_probe import probe_media
+from src.services.video_editing.filter_graph import (
+    build_filter,
+    build_trim_concat_filter,
+)
+from src.services.video_editing.parallel_render import BatchedRenderer
+from src.services.video_editing.render_profile import FINAL_PROFILE
+
+
+def generate_video(path: str, minutes: float) -> None:
+    """Write a 720p testsrc2 video with a sine tone."""
+    seconds = str(minutes * 60)
+
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=size=1280x720:rate=30:duration={seconds}",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:duration={seconds}",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-c:a",
+            "aac",
+            path,
+        ],
+        check=True,
+    )
+
+
+def random_timeline(duration: float, cuts: int, seed: int = 0) -> Timeline:
+    """Keep half of the video as cuts evenly spread random-length segments."""
+    rng = np.random.default_rng(seed)
+    edges = np.sort(rng.uniform(0, duration, 2 * cuts))
+
+    return Timeline(edges[0::2], edges[1::2])
+
+
+def measure(run) -> tuple:
+    """
+    Run a render in a forked child and read its peak RSS.
+
+    wait4 reports the largest resident set among the child and the ffmpeg
+    processes it waited for.
+
+    Returns:
+        Wall time in seconds and peak RSS in MiB
+    """
+    started = time.perf_counter()
+    pid = os.fork()
+
+    if pid == 0:
+        # The child must never unwind into the parent's code, so it always
+        # leaves through os._exit and reports a failure in its exit status
+        status = 0
+
+        try:
+            run()
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    _, status, usage = os.wait4(pid, 0)
+    elapsed = time.perf_counter() - started
+
+    if status != 0:
+        raise RuntimeError("Render failed")
+
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def single_pass(video_path, name, filter_script, work_dir):
+    filter_path = os.path.join(work_dir, f"{name}_filter.txt")
+
+    with open(filter_path, "w") as f:
+        f.write(filter_script)
+
+    def run():
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-i",
+                video_path,
+                "-filter_complex_script",
+                filter_path,
+                "-map",
+                "[outv]",
+                "-map",
+                "[outa]",
+                "-preset",
+                "ultrafast",
+                os.path.join(work_dir, "out.mp4"),
+            ],
+            check=True,
+        )
+
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=20)
+    parser.add_argument(
+        "--cuts", type=int, nargs="+", default=[10, 100, 1000, 3000]
+    )
+    parser.add_argument("--max-concat-cuts", type=int, default=1000)
+    args = parser.parse_args()
+
+    settings = Settings()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        video_path = os.path.join(work_dir, "testsrc.mp4")
+        generate_video(video_path, args.minutes)
+
+        print(f"Source: {args.minutes:.0f} min 720p30 testsrc2")
+        print(f"{'strategy':>8} {'cuts':>6} {'seconds':>8} {'peak MiB':>9}")
+
+        for cuts in args.cuts:
+            timeline = random_timeline(args.minutes * 60, cuts)
+            strategies = {
+                "select": single_pass(
+                    video_path,
+                    "select",
+                    build_filter(timeline, max_concat_segments=0),
+                    work_dir,
+                ),
+                "batched": lambda: BatchedRenderer(
+                    settings, work_dir, FINAL_PROFILE
+                ).render(
+                    video_path,
+                    probe_media(video_path, work_dir, with_packets=True),
+                    timeline,
+                    os.path.join(work_dir, "out.mp4"),
+                    lambda _: None,
+                ),
+            }
+
+            # trim/concat is what runs out of memory; skip it past the limit
+            if cuts <= args.max_concat_cuts:
+                strategies["concat"] = single_pass(
+                    video_path,
+                    "concat",
+                    build_trim_concat_filter(timeline),
+                    work_dir,
+                )
+
+            for name, run in strategies.items():
+                elapsed, peak = measure(run)
+                print(f"{name:>8} {cuts:6d} {elapsed:8.1f} {peak:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Compare sequential and parallel Silero VAD on synthetic long audio.
+
+Usage:
+    python -m benchmarks.vad_parallel --minutes 60 --workers 4 8 16
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import torch
+
+from src.config.settings import Settings
+from src.services.audio.pcm import SAMPLE_RATE, load_pcm, to_float32
+from src.services.audio.vad import SileroVAD, parallel_speech_timestamps
+
+
+def generate_audio(path: str, minutes: float, seed: int = 0) -> None:
+    """Write alternating voiced bursts and near-silence as raw PCM."""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+
+    with open(path, "wb") as f:
+        written = 0
+
+        while written < total:
+            voiced = int(rng.uniform(0.5, 4.0) * SAMPLE_RATE)
+            silence = int(rng.uniform(0.3, 2.0) * SAMPLE_RATE)
+
+            t = np.arange(voiced) / SAMPLE_RATE
+            pitch = rng.uniform(90, 220)
+            burst = sum(
+                np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6)
+            )
+            # ~4 Hz syllable envelope on top of the harmonic stack
+            burst *= 0.5 * (1 + np.sin(2 * np.pi * 4 * t)) * 0.3
+            burst += rng.normal(0, 0.01, voiced)
+
+            quiet = rng.normal(0, 0.002, silence)
+
+            chunk = np.concatenate([burst, quiet])
+            f.write((np.clip(chunk, -1, 1) * 32767).astype(np.int16))
+            written += len(chunk)
+
+
+def boundary_errors(reference: list, candidate: list) -> np.ndarray:
+    """Distance in ms from each reference boundary to the nearest match."""
+    if not reference or not candidate:
+        return np.array([])
+
+    errors = []
+
+    for key in ("start", "end"):
+        ref = np.array([ts[key] for ts in reference])
+        cand = np.sort(np.array([ts[key] for ts in candidate]))
+
+        idx = np.clip(np.searchsorted(cand, ref), 1, len(cand) - 1)
+        nearest = np.minimum(
+            np.abs(cand[idx] - ref), np.abs(cand[idx - 1] - ref)
+        )
+        errors.append(nearest * 1000 / SAMPLE_RATE)
+
+    return np.concatenate(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[4])
+    parser.add_argument("--chunk-seconds", type=float, default=300)
+    parser.add_argument("--overlap-seconds", type=float, default=2)
+    parser.add_argument("--tolerance-ms", type=float, default=100)
+    args = parser.parse_args()
+
+    settings = Settings()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_path = os.path.join(temp_dir, "synthetic.pcm")
+        generate_audio(audio_path, args.minutes)
+
+        vad = SileroVAD(settings)
+        vad.load()
+
+        wav = torch.from_numpy(to_float32(load_pcm(audio_path)))
+
+        started = time.perf_counter()
+        reference = vad.get_speech_timestamps(
+            wav, vad.model, sampling_rate=SAMPLE_RATE
+        )
+        sequential_time = time.perf_counter() - started
+
+        print(f"Audio: {args.minutes:.0f} min synthetic PCM")
+        print(
+            f"sequential   {sequential_time:8.2f}s  "
+            f"{len(reference):6d} regions"
+        )
+
+        for workers in args.workers:
+            started = time.perf_counter()
+            result = parallel_speech_timestamps(
+                settings,
+                audio_path,
+                workers=workers,
+                chunk_seconds=args.chunk_seconds,
+                overlap_seconds=args.overlap_seconds,
+            )
+            elapsed = time.perf_counter() - started
+
+            errors = boundary_errors(reference, result)
+            within = (
+                float(np.mean(errors <= args.tolerance_ms)) * 100
+                if len(errors)
+                else 100.0
+            )
+
+            print(
+                f"parallel x{workers:<3d}{elapsed:8.2f}s  "
+                f"{len(result):6d} regions  "
+                f"speedup {sequential_time / elapsed:5.2f}x  "
+                f"{within:5.1f}% boundaries within {args.tolerance_ms:.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import argparse
 import sys
 import os
 import traceback
@@ -7,16 +8,24 @@ from src.config.settings import Settings
 from src.core.video_processor import VideoProcessor
 from src.services.ai.openai import OpenAI
 from src.services.audio.audio_extractor import AudioExtractorService
+from src.services.ingest.ingester import IngestService
 from src.services.transcription.transcriber import TranscriptionService
 from src.services.text_analysis.text_analyzer import TextAnalyzerService
 from src.services.video_editing.video_editor import VideoEditorService
 from src.services.content.content_generator import ContentGeneratorService
 
-
 load_dotenv()
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--final",
+        action="store_true",
+        help="Render the saved cut lists at full quality",
+    )
+    args = parser.parse_args()
+
     sys.stderr = open(os.devnull, "w")
 
     # Load settings
@@ -34,6 +43,15 @@ def main():
         settings=settings, ai_service=ai_service
     )
 
+    ingester = None
+
+    if settings.ingest_single_pass:
+        ingester = IngestService(
+            settings,
+            audio_extractor=audio_extractor,
+            video_editor=video_editor,
+        )
+
     # Create the video processor with all dependencies
     processor = VideoProcessor(
         audio_extractor=audio_extractor,
@@ -42,20 +60,40 @@ def main():
         video_editor=video_editor,
         content_generator=content_generator,
         settings=settings,
+        ingester=ingester,
     )
 
-    # Process all videos
+    video_paths = []
+
     for video_file in os.listdir(settings.raw_dir):
         if not video_file.lower().endswith(settings.video_formats):
             print("There is no video file to process.")
             continue
 
-        video_path = os.path.join(settings.raw_dir, video_file)
+        video_paths.append(os.path.join(settings.raw_dir, video_file))
+
+    if args.final:
+        for video_path in video_paths:
+            try:
+                processor.render_final(video_path)
+            except Exception as e:
+                traceback.print_exc()
+                print(
+                    f"Error rendering {os.path.basename(video_path)}: {str(e)}"
+                )
+
+        return
+
+    if settings.batch_transcription:
+        processor.prepare_transcriptions(video_paths)
+
+    # Process all videos
+    for video_path in video_paths:
         try:
             processor.process_video(video_path)
         except Exception as e:
             traceback.print_exc()
-            print(f"Error processing {video_file}: {str(e)}")
+            print(f"Error processing {os.path.basename(video_path)}: {str(e)}")
 
 
 if __name__ == "__main__":
@@ -12,6 +12,151 @@ class Settings:
 
     video_formats: tuple = (".mp4", ".mov", ".avi", ".mkv")
 
+    # "pcm" decodes the soundtrack once to raw 16 kHz mono s16le, which is
+    # read directly by VAD and transcription. "mp3" keeps the legacy
+    # lossy artifact.
+    audio_format: str = os.environ.get("AUDIO_FORMAT", "pcm")
+
+    # "full" runs VAD over the whole waveform at once, "streaming" reads
+    # fixed windows so memory stays constant regardless of duration,
+    # "parallel" splits PCM audio into overlapping chunks across processes
+    # and "probabilities" caches per-frame speech probabilities so segments
+    # can be recomputed without running the model again.
+    vad_mode: str = os.environ.get("VAD_MODE", "full")
+    vad_window_seconds: int = int(os.environ.get("VAD_WINDOW_SECONDS", "30"))
+    vad_workers: int = int(os.environ.get("VAD_WORKERS", os.cpu_count() or 1))
+    vad_chunk_seconds: float = float(
+        os.environ.get("VAD_CHUNK_SECONDS", "300")
+    )
+    vad_overlap_seconds: float = float(
+        os.environ.get("VAD_OVERLAP_SECONDS", "2")
+    )
+
+    # Thresholding used by the "probabilities" mode
+    vad_threshold: float = float(os.environ.get("VAD_THRESHOLD", "0.5"))
+
+    # Speech regions closer than the gap are merged into one segment, as
+    # long as it stays under the maximum length (seconds)
+    segment_gap_threshold: float = float(
+        os.environ.get("SEGMENT_GAP_THRESHOLD", "1.0")
+    )
+    max_segment_length: float = float(
+        os.environ.get("MAX_SEGMENT_LENGTH", "5.0")
+    )
+
+    # Silero VAD is loaded from this local cache; it is only downloaded when
+    # the pinned version is missing and VAD_OFFLINE is not set.
+    vad_model_dir: str = os.environ.get(
+        "VAD_MODEL_DIR", "data/models/silero-vad"
+    )
+    vad_model_version: str = os.environ.get("VAD_MODEL_VERSION", "v5.1")
+    vad_offline: bool = bool(os.environ.get("VAD_OFFLINE"))
+    # "torch" (TorchScript) or "onnx" (ONNX Runtime on CPU)
+    vad_backend: str = os.environ.get("VAD_BACKEND", "torch")
+
+    # Speech recognition engine: "transformers" (float32 on CPU),
+    # "transformers-int8" (dynamically quantized Linear layers) or
+    # "faster-whisper" (CTranslate2, see asr_compute_type)
+    asr_backend: str = os.environ.get("ASR_BACKEND", "transformers")
+    asr_model_size: str = os.environ.get("ASR_MODEL_SIZE", "large-v3")
+    asr_compute_type: str = os.environ.get("ASR_COMPUTE_TYPE", "int8")
+    asr_language: str = os.environ.get("ASR_LANGUAGE", "pt")
+    # Speech segments transcribed per Whisper generate call
+    asr_batch_size: int = int(os.environ.get("ASR_BATCH_SIZE", "8"))
+    # More than one worker runs ASR in separate processes, each limited to
+    # asr_threads_per_worker torch threads
+    asr_workers: int = int(os.environ.get("ASR_WORKERS", "1"))
+    asr_threads_per_worker: int = int(
+        os.environ.get(
+            "ASR_THREADS_PER_WORKER",
+            max((os.cpu_count() or 1) // max(asr_workers, 1), 1),
+        )
+    )
+    # Unix socket of the persistent ASR worker (make asr-worker); runs
+    # transcribe in-process when no worker listens on it
+    asr_worker_socket: str = os.environ.get(
+        "ASR_WORKER_SOCKET", os.path.join(temp_dir, "asr-worker.sock")
+    )
+    # "segments" transcribes every VAD segment separately, "long_form"
+    # transcribes the whole audio with word timestamps and maps the words
+    # back onto the VAD segments
+    transcription_mode: str = os.environ.get("TRANSCRIPTION_MODE", "segments")
+    # SQLite cache of transcriptions keyed by segment audio; empty disables
+    # it
+    transcription_cache_path: str = os.environ.get(
+        "TRANSCRIPTION_CACHE_PATH", "data/cache/transcriptions.sqlite"
+    )
+
+    # Overlap VAD and transcription: segments are transcribed while VAD
+    # is still running (requires VAD_MODE=streaming to overlap)
+    pipeline_streaming: bool = bool(os.environ.get("PIPELINE_STREAMING"))
+    pipeline_queue_size: int = int(os.environ.get("PIPELINE_QUEUE_SIZE", "64"))
+
+    # Transcribe every video in raw_dir in shared ASR batches before
+    # processing them one by one
+    batch_transcription: bool = bool(os.environ.get("BATCH_TRANSCRIPTION"))
+
+    # How edited videos are rendered: "single" re-encodes everything in one
+    # filter graph, "smart_cut" stream-copies whole GOPs and only re-encodes
+    # the frames around each cut, "parallel" encodes equal-duration chunks
+    # in render_workers concurrent ffmpeg processes, "incremental" encodes
+    # every segment separately and reuses them from render_cache_dir
+    render_mode: str = os.environ.get("RENDER_MODE", "single")
+    render_cache_dir: str = os.environ.get(
+        "RENDER_CACHE_DIR", "data/cache/render"
+    )
+    # Least recently used encodes are evicted past this size (default 20 GB)
+    render_cache_max_bytes: int = int(
+        os.environ.get("RENDER_CACHE_MAX_BYTES", str(20 * 1024**3))
+    )
+    # Filter graphs with more segments than this use select/aselect instead
+    # of one trim/concat chain per segment
+    filter_concat_max_segments: int = int(
+        os.environ.get("FILTER_CONCAT_MAX_SEGMENTS", "64")
+    )
+    # Single-pass renders with more segments than this are split into
+    # sub-renders of this many segments
+    filter_batch_segments: int = int(
+        os.environ.get("FILTER_BATCH_SEGMENTS", "512")
+    )
+    render_workers: int = int(
+        os.environ.get("RENDER_WORKERS", max((os.cpu_count() or 1) // 4, 1))
+    )
+    render_threads_per_worker: int = int(
+        os.environ.get(
+            "RENDER_THREADS_PER_WORKER",
+            max((os.cpu_count() or 1) // max(render_workers, 1), 1),
+        )
+    )
+
+    # "final" renders at full quality; "preview" renders quickly from a
+    # preview_height proxy and saves the cut list for render_final
+    render_profile: str = os.environ.get("RENDER_PROFILE", "final")
+    preview_height: int = int(os.environ.get("PREVIEW_HEIGHT", "360"))
+
+    # Extra output formats of final renders, written next to the edit as
+    # edited_<name>_<video>, as name:WIDTHxHEIGHT[:crop][:max bitrate]
+    # entries, e.g. "horizontal:1920x1080:8M,vertical:1080x1920:crop:6M".
+    # Single-pass renders make them from the same decode; the other render
+    # modes derive them from the finished edit
+    renditions: str = os.environ.get("RENDITIONS", "")
+
+    # Decode each source once into the analysis audio, the preview proxy
+    # and thumbnail_count candidate thumbnails before processing it
+    ingest_single_pass: bool = bool(os.environ.get("INGEST_SINGLE_PASS"))
+    thumbnail_count: int = int(os.environ.get("THUMBNAIL_COUNT", "12"))
+    thumbnail_height: int = int(os.environ.get("THUMBNAIL_HEIGHT", "720"))
+
+    # Videos with more speech segments than refine_window_segments are
+    # refined in overlapping windows, refine_workers requests at a time
+    refine_window_segments: int = int(
+        os.environ.get("REFINE_WINDOW_SEGMENTS", "120")
+    )
+    refine_window_overlap: int = int(
+        os.environ.get("REFINE_WINDOW_OVERLAP", "10")
+    )
+    refine_workers: int = int(os.environ.get("REFINE_WORKERS", "4"))
+
     is_trello_enabled: bool = False
 
     def __init__(self):
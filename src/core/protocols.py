@@ -1,13 +1,19 @@
-from typing import Protocol, List
+from typing import Dict, Iterator, Protocol, List
 
 from rich.progress import Progress
 
 
+class Ingester(Protocol):
+    def ingest(self, video_path: str) -> None: ...
+
+
 class AudioExtractor(Protocol):
     def extract_audio(self, video_path: str) -> str: ...
 
     def extract_raw_segments(self, audio_path: str) -> List: ...
 
+    def iter_raw_segments(self, audio_path: str) -> Iterator[dict]: ...
+
 
 class Transcriber(Protocol):
     def transcribe(
@@ -16,6 +22,20 @@ class Transcriber(Protocol):
         speech_segments: List,
     ) -> List: ...
 
+    def transcribe_stream(
+        self,
+        audio_path: str,
+        speech_segments: Iterator[dict],
+    ) -> List: ...
+
+    def transcribe_many(self, jobs: Dict[str, List]) -> Dict[str, List]: ...
+
+
+class SpeechRecognizer(Protocol):
+    def transcribe(self, audio_segments: List) -> List: ...
+
+    def transcribe_words(self, audio) -> List: ...
+
 
 class TextAnalyzer(Protocol):
     def refine_speech_segments(
@@ -31,6 +51,10 @@ class VideoEditor(Protocol):
         self, video_path: str, segments: List, progress_manager: Progress
     ) -> None: ...
 
+    def render_final(
+        self, video_path: str, progress_manager: Progress
+    ) -> None: ...
+
 
 class ContentGenerator(Protocol):
     def generate_captions(self, segments: List, video_path: str) -> str: ...
@@ -0,0 +1,314 @@
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+class Timeline:
+    """
+    Ordered speech segments stored as NumPy start/end arrays.
+
+    Stages still exchange the {"start", "end", "text"} JSON lists; a
+    Timeline converts to and from them losslessly and replaces the
+    per-segment Python loops with array operations. Times are seconds.
+    """
+
+    def __init__(
+        self,
+        starts: Iterable[float],
+        ends: Iterable[float],
+        texts: Optional[Sequence] = None,
+    ):
+        self.starts = np.asarray(starts, dtype=np.float64).reshape(-1)
+        self.ends = np.asarray(ends, dtype=np.float64).reshape(-1)
+        self.texts = None
+
+        if len(self.starts) != len(self.ends):
+            raise ValueError("Timeline starts and ends differ in length.")
+
+        if texts is not None:
+            self.texts = np.empty(len(self.starts), dtype=object)
+            self.texts[:] = list(texts)
+
+    @classmethod
+    def from_segments(cls, segments: List) -> "Timeline":
+        """Build a timeline from a list of segment dicts."""
+        has_text = any("text" in seg for seg in segments)
+
+        return cls(
+            [seg["start"] for seg in segments],
+            [seg["end"] for seg in segments],
+            [seg.get("text") for seg in segments] if has_text else None,
+        )
+
+    def to_segments(self) -> List:
+        """Convert back to the list of segment dicts used in JSON."""
+        segments = [
+            {"start": start, "end": end}
+            for start, end in zip(self.starts.tolist(), self.ends.tolist())
+        ]
+
+        if self.texts is not None:
+            for segment, text in zip(segments, self.texts):
+                if text is not None:
+                    segment["text"] = text
+
+        return segments
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index) -> "Timeline":
+        texts = None if self.texts is None else self.texts[index]
+
+        return Timeline(self.starts[index], self.ends[index], texts)
+
+    def spans(self) -> List[tuple]:
+        """(start, end) pairs as plain Python floats."""
+        return list(zip(self.starts.tolist(), self.ends.tolist()))
+
+    @property
+    def durations(self) -> np.ndarray:
+        return self.ends - self.starts
+
+    @property
+    def duration(self) -> float:
+        """Total duration of all segments."""
+        return float(self.durations.sum())
+
+    def with_texts(self, texts: Sequence) -> "Timeline":
+        return Timeline(self.starts, self.ends, texts)
+
+    def merge(
+        self, gap_threshold: float, max_segment_length: float
+    ) -> "Timeline":
+        """
+        Merge neighbouring segments separated by small gaps.
+
+        A segment joins the current one when the gap before it is below
+        gap_threshold and the merged segment stays within
+        max_segment_length. Runs split only by small gaps that fit whole
+        are merged in one vectorized step; only over-long runs are walked
+        segment by segment. Texts of merged segments are joined by spaces.
+
+        Args:
+            gap_threshold: Largest gap (seconds) that can be merged over
+            max_segment_length: Longest merged segment (seconds)
+
+        Returns:
+            New merged timeline
+        """
+        count = len(self)
+
+        if count == 0:
+            return self
+
+        gaps = self.starts[1:] - self.ends[:-1]
+        breaks = np.flatnonzero(gaps >= gap_threshold) + 1
+
+        run_firsts = np.concatenate(([0], breaks))
+        run_lasts = np.concatenate((breaks, [count])) - 1
+        run_lengths = self.ends[run_lasts] - self.starts[run_firsts]
+
+        is_group_start = np.zeros(count, dtype=bool)
+        is_group_start[run_firsts] = True
+
+        too_long = np.flatnonzero(run_lengths > max_segment_length)
+
+        for first, last in zip(run_firsts[too_long], run_lasts[too_long]):
+            group_start = self.starts[first]
+
+            for i in range(first + 1, last + 1):
+                if self.ends[i] - group_start > max_segment_length:
+                    is_group_start[i] = True
+                    group_start = self.starts[i]
+
+        group_firsts = np.flatnonzero(is_group_start)
+        group_lasts = np.concatenate((group_firsts[1:], [count])) - 1
+
+        texts = None
+
+        if self.texts is not None:
+            group_ids = np.cumsum(is_group_start) - 1
+            texts = [[] for _ in group_firsts]
+
+            for group_id, text in zip(group_ids, self.texts):
+                if text:
+                    texts[group_id].append(text)
+
+            texts = [" ".join(group) for group in texts]
+
+        return Timeline(
+            self.starts[group_firsts], self.ends[group_lasts], texts
+        )
+
+    def split(self, times: Iterable[float]) -> "Timeline":
+        """
+        Cut segments at the given times.
+
+        Text stays on the first piece of a split segment.
+
+        Args:
+            times: Cut points in seconds
+
+        Returns:
+            New timeline where no segment crosses a cut point
+        """
+        times = np.unique(np.asarray(list(times), dtype=np.float64))
+
+        # Only cut points strictly inside a segment produce a new piece
+        owners = _containing(self, times)
+        inside = owners >= 0
+        inside[inside] = times[inside] > self.starts[owners[inside]]
+        cuts = times[inside]
+
+        # Segments are sorted and disjoint, so each cut closes one piece
+        # and opens the next
+        starts = np.sort(np.concatenate((self.starts, cuts)))
+        ends = np.sort(np.concatenate((self.ends, cuts)))
+
+        texts = None
+
+        if self.texts is not None:
+            owners = _containing(self, starts)
+            is_first_piece = starts == self.starts[owners]
+            texts = np.where(is_first_piece, self.texts[owners], None)
+
+        return Timeline(starts, ends, texts)
+
+    def intersect(self, other: "Timeline") -> "Timeline":
+        """Keep only the parts of these segments covered by other."""
+        return self._overlay(other, keep_covered=True)
+
+    def subtract(self, other: "Timeline") -> "Timeline":
+        """Remove the parts of these segments covered by other."""
+        return self._overlay(other, keep_covered=False)
+
+    def _overlay(self, other: "Timeline", keep_covered: bool) -> "Timeline":
+        # Both timelines are sorted and non-overlapping; cut everything at
+        # every boundary and classify each elementary interval by its
+        # midpoint.
+        points = np.unique(
+            np.concatenate((self.starts, self.ends, other.starts, other.ends))
+        )
+
+        if len(points) < 2:
+            return self[np.zeros(0, dtype=np.int64)]
+
+        lows, highs = points[:-1], points[1:]
+        midpoints = (lows + highs) / 2
+
+        owners = _containing(self, midpoints)
+        covered = _containing(other, midpoints) >= 0
+
+        keep = (owners >= 0) & (covered == keep_covered)
+
+        if not keep.any():
+            return self[np.zeros(0, dtype=np.int64)]
+
+        lows, highs, owners = lows[keep], highs[keep], owners[keep]
+
+        # Coalesce contiguous pieces that come from the same segment
+        is_first = np.ones(len(lows), dtype=bool)
+        is_first[1:] = (owners[1:] != owners[:-1]) | (lows[1:] != highs[:-1])
+
+        firsts = np.flatnonzero(is_first)
+        lasts = np.concatenate((firsts[1:], [len(lows)])) - 1
+
+        texts = None
+
+        if self.texts is not None:
+            texts = self.texts[owners[firsts]]
+
+        return Timeline(lows[firsts], highs[lasts], texts)
+
+    def assign_words(
+        self,
+        word_starts: Iterable[float],
+        word_ends: Iterable[float],
+        words: Sequence[str],
+        tolerance: float = 0.5,
+    ) -> "Timeline":
+        """
+        Attach timestamped words to the segments they fall in.
+
+        Each word goes to the segment containing its midpoint, or to the
+        nearest segment when it lands in a gap no further than tolerance
+        away; words further out are dropped.
+
+        Args:
+            word_starts: Word start times in seconds
+            word_ends: Word end times in seconds
+            words: Word texts
+            tolerance: Largest distance (seconds) to snap a word across
+
+        Returns:
+            Same segments with the joined words as texts
+        """
+        starts = np.asarray(word_starts, dtype=np.float64)
+        ends = np.asarray(word_ends, dtype=np.float64)
+        midpoints = (starts + ends) / 2
+
+        owners = _containing(self, midpoints)
+
+        if len(self) and len(midpoints):
+            # Words in gaps go to the closer of the two neighbours
+            following = np.searchsorted(self.starts, midpoints)
+            after = np.clip(following, 0, len(self) - 1)
+            before = np.clip(following - 1, 0, len(self) - 1)
+
+            distance_after = np.abs(self.starts[after] - midpoints)
+            distance_before = np.abs(midpoints - self.ends[before])
+
+            nearest = np.where(
+                distance_before <= distance_after, before, after
+            )
+            distance = np.minimum(distance_before, distance_after)
+
+            snap = (owners < 0) & (distance <= tolerance)
+            owners = np.where(snap, nearest, owners)
+
+        texts = [[] for _ in range(len(self))]
+
+        for owner, word in zip(owners.tolist(), words):
+            word = word.strip()
+
+            if owner >= 0 and word:
+                texts[owner].append(word)
+
+        return self.with_texts([" ".join(text) for text in texts])
+
+    def to_source_time(self, edit_times: Iterable[float]) -> np.ndarray:
+        """
+        Map times in the edited video back to times in the source.
+
+        The edited video is these segments played back to back, so a time
+        t falls in the segment whose cumulative range contains it.
+
+        Args:
+            edit_times: Times in the edited video, in seconds
+
+        Returns:
+            Corresponding source times
+        """
+        edit_times = np.asarray(edit_times, dtype=np.float64)
+
+        if len(self) == 0:
+            return np.full(edit_times.shape, np.nan)
+
+        cumulative_ends = np.cumsum(self.durations)
+        cumulative_starts = cumulative_ends - self.durations
+
+        index = np.searchsorted(cumulative_ends, edit_times, side="right")
+        index = np.clip(index, 0, len(self) - 1)
+
+        return self.starts[index] + (edit_times - cumulative_starts[index])
+
+
+def _containing(timeline: Timeline, times: np.ndarray) -> np.ndarray:
+    """Index of the segment containing each time, or -1."""
+    index = np.searchsorted(timeline.starts, times, side="right") - 1
+    valid = index >= 0
+    inside = np.zeros(len(times), dtype=bool)
+    inside[valid] = times[valid] < timeline.ends[index[valid]]
+
+    return np.where(inside, index, -1)
@@ -1,9 +1,12 @@
 import os
 from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 from src.core.progress_manager import progress_object
+from src.infrastructure.ffmpeg import record_metrics
 from src.core.protocols import (
     AudioExtractor,
+    Ingester,
     Transcriber,
     TextAnalyzer,
     VideoEditor,
@@ -22,6 +25,7 @@ class VideoProcessor:
         video_editor: VideoEditor,
         content_generator: ContentGenerator,
         settings=None,
+        ingester: Optional[Ingester] = None,
     ):
         # Initialize components
         self.audio_extractor = audio_extractor
@@ -29,6 +33,7 @@ class VideoProcessor:
         self.text_analyzer = text_analyzer
         self.video_editor = video_editor
         self.content_generator = content_generator
+        self.ingester = ingester
         self.trello = Trello()
         self.settings = settings
 
@@ -44,6 +49,110 @@ class VideoProcessor:
 
         os.system(f"rm -r {folder_path}")
 
+    def ingest(self, video_path: str) -> None:
+        """Decode the source once for every later stage, when enabled."""
+        if self.ingester is not None:
+            self.ingester.ingest(video_path)
+
+    def get_metrics_path(self, video_path: str) -> str:
+        """Per-video JSONL file collecting the stats of every ffmpeg run."""
+        folder_path = os.path.join(
+            self.settings.output_dir, get_file_name(video_path)
+        )
+
+        check_or_create_folder(folder_path)
+
+        return os.path.join(folder_path, "metrics.jsonl")
+
+    def prepare_transcriptions(self, video_paths: List[str]) -> None:
+        """
+        Transcribe several videos together so ASR batches fill up.
+
+        Audio and speech segments are extracted for every video first and
+        transcribed in shared batches; process_video then finds everything
+        cached. Failures are left for process_video to retry and report.
+
+        Args:
+            video_paths (list): Paths to the video files.
+        """
+        jobs = {}
+
+        for video_path in video_paths:
+            try:
+                self.create_temp_folder(video_path)
+
+                with record_metrics(self.get_metrics_path(video_path)):
+                    self.ingest(video_path)
+
+                    audio_path = self.audio_extractor.extract_audio(
+                        video_path=video_path,
+                    )
+
+                jobs[audio_path] = self.audio_extractor.extract_raw_segments(
+                    audio_path,
+                )
+            except Exception as e:
+                print(f"Error preparing {video_path}: {str(e)}")
+
+        if not jobs:
+            return
+
+        try:
+            self.transcriber.transcribe_many(jobs)
+        except Exception as e:
+            print(f"Error in batch transcription: {str(e)}")
+
+    def transcribe_audio(self, audio_path: str) -> List:
+        """
+        Run VAD and transcription, overlapped when streaming is enabled.
+
+        Args:
+            audio_path (str): Path to the extracted audio.
+
+        Returns:
+            list: Transcribed speech segments
+        """
+        if self.settings.pipeline_streaming:
+            # ASR consumes segments while VAD is still producing them
+            return self.transcriber.transcribe_stream(
+                audio_path=audio_path,
+                speech_segments=self.audio_extractor.iter_raw_segments(
+                    audio_path
+                ),
+            )
+
+        speech_segments = self.audio_extractor.extract_raw_segments(
+            audio_path,
+        )
+
+        return self.transcriber.transcribe(
+            audio_path=audio_path,
+            speech_segments=speech_segments,
+        )
+
+    def render_final(self, video_path: str) -> None:
+        """
+        Render the full-quality edit of a previously previewed video.
+
+        Args:
+            video_path (str): Path to the video file.
+        """
+        file_name = get_file_name(video_path)
+
+        with (
+            progress_object as progress_manager,
+            record_metrics(self.get_metrics_path(video_path)),
+        ):
+            print(f"Rendering final video: {file_name}")
+
+            self.video_editor.render_final(
+                video_path, progress_manager=progress_manager
+            )
+
+            self.delete_temp_folder(video_path)
+
+            print(f"Video {file_name} rendered ✅")
+
     def process_video(self, video_path: str):
         """
         Process a single video and generate outputs.
@@ -56,24 +165,22 @@ class VideoProcessor:
         """
         file_name = get_file_name(video_path)
 
-        with progress_object as progress_manager:
+        with (
+            progress_object as progress_manager,
+            record_metrics(self.get_metrics_path(video_path)),
+        ):
             try:
                 print(f"Processing video: {file_name}")
 
                 self.create_temp_folder(video_path)
 
+                self.ingest(video_path)
+
                 audio_path = self.audio_extractor.extract_audio(
                     video_path=video_path,
                 )
 
-                speech_segments = self.audio_extractor.extract_raw_segments(
-                    audio_path,
-                )
-
-                transcribed_speech_segments = self.transcriber.transcribe(
-                    audio_path=audio_path,
-                    speech_segments=speech_segments,
-                )
+                transcribed_speech_segments = self.transcribe_audio(audio_path)
 
                 captions = self.content_generator.generate_captions(
                     video_path=video_path,
@@ -127,7 +234,9 @@ class VideoProcessor:
                         linkedin_comment.result()
                         threads_comment.result()
 
-                self.delete_temp_folder(video_path)
+                # Previews keep the proxy and caches for re-runs
+                if self.settings.render_profile != "preview":
+                    self.delete_temp_folder(video_path)
 
                 print(f"Video {file_name} completed ✅")
             except Exception as e:
@@ -0,0 +1,206 @@
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+# ffmpeg writes key=value progress blocks here instead of the stats line;
+# stdout stays free for commands that stream media through it
+PROGRESS_ARGS = ["-nostats", "-progress", "pipe:2"]
+
+# Log lines kept for the error message of a failed run
+LOG_TAIL_LINES = 20
+
+_metrics_lock = threading.Lock()
+_metrics_path: Optional[str] = None
+
+
+@dataclass
+class FFmpegStats:
+    """What one ffmpeg invocation did, from its -progress output"""
+
+    label: str
+    returncode: Optional[int] = None
+    elapsed: float = 0.0
+    out_time: float = 0.0
+    frames: int = 0
+    fps: float = 0.0
+    speed: float = 0.0
+    bitrate: str = ""
+    total_size: int = 0
+    stdout: bytes = field(default=b"", repr=False)
+
+    def to_metrics(self) -> dict:
+        metrics = asdict(self)
+        del metrics["stdout"]
+
+        metrics["finished_at"] = datetime.now(timezone.utc).isoformat()
+
+        return metrics
+
+    def update(self, key: str, value: str) -> None:
+        """Apply one key=value line of ffmpeg's progress output."""
+        if value in ("", "N/A"):
+            return
+
+        try:
+            if key == "out_time_us":
+                self.out_time = max(int(value), 0) / 1_000_000
+            elif key == "frame":
+                self.frames = int(value)
+            elif key == "fps":
+                self.fps = float(value)
+            elif key == "speed":
+                self.speed = float(value.rstrip("x"))
+            elif key == "bitrate":
+                self.bitrate = value
+            elif key == "total_size":
+                self.total_size = int(value)
+        except ValueError:
+            pass
+
+
+class FFmpegError(RuntimeError):
+    """ffmpeg exited with a non-zero status"""
+
+    def __init__(self, stats: FFmpegStats, log: List[str]):
+        self.stats = stats
+        self.log = log
+
+        super().__init__(
+            f"ffmpeg {stats.label} failed with exit status "
+            f"{stats.returncode}:\n" + "\n".join(log)
+        )
+
+
+@contextmanager
+def record_metrics(metrics_path: str):
+    """
+    Append the stats of every ffmpeg run inside the block to a JSONL file.
+
+    Args:
+        metrics_path: File receiving one JSON object per invocation
+    """
+    global _metrics_path
+
+    previous, _metrics_path = _metrics_path, metrics_path
+
+    try:
+        yield
+    finally:
+        _metrics_path = previous
+
+
+@contextmanager
+def atomic_output(final_path: str):
+    """
+    Write an output under a temporary name, moving it in place on success.
+
+    An interrupted or failed run never leaves a truncated file that looks
+    complete to the caches checking for final_path. The temporary name
+    keeps the extension, so ffmpeg still picks the right muxer.
+
+    Args:
+        final_path: File or folder the block produces
+
+    Yields:
+        Path the block should write to instead
+    """
+    root, extension = os.path.splitext(final_path)
+    partial_path = f"{root}.partial{extension}"
+
+    try:
+        yield partial_path
+    except BaseException:
+        if os.path.isdir(partial_path):
+            shutil.rmtree(partial_path)
+        elif os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    os.replace(partial_path, final_path)
+
+
+def _write_metrics(stats: FFmpegStats) -> None:
+    with _metrics_lock:
+        if _metrics_path is None:
+            return
+
+        with open(_metrics_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(stats.to_metrics()) + "\n")
+
+
+def run_ffmpeg(
+    command: List[str],
+    label: str,
+    on_progress: Optional[Callable[[FFmpegStats], None]] = None,
+    capture_stdout: bool = False,
+) -> FFmpegStats:
+    """
+    Run ffmpeg, following its progress and failing loudly.
+
+    Args:
+        command: ffmpeg command line, starting with "ffmpeg"
+        label: Name of the step, used in metrics and errors
+        on_progress: Called with the running stats after every progress
+            block ffmpeg reports
+        capture_stdout: Keep what ffmpeg writes to stdout in stats.stdout
+
+    Returns:
+        Final stats of the run
+
+    Raises:
+        FFmpegError: ffmpeg exited with a non-zero status
+    """
+    stats = FFmpegStats(label=label)
+    log = deque(maxlen=LOG_TAIL_LINES)
+
+    started = time.perf_counter()
+
+    process = subprocess.Popen(
+        command[:1] + PROGRESS_ARGS + command[1:],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+
+    def read_progress():
+        for raw_line in process.stderr:
+            line = raw_line.decode("utf-8", errors="replace").strip()
+            key, separator, value = line.partition("=")
+
+            if not separator or " " in key:
+                if line:
+                    log.append(line)
+                continue
+
+            if key == "progress":
+                stats.elapsed = time.perf_counter() - started
+                if on_progress is not None:
+                    on_progress(stats)
+            else:
+                stats.update(key, value.strip())
+
+    # stderr is drained on a thread so a large stdout can't deadlock
+    reader = threading.Thread(target=read_progress, daemon=True)
+    reader.start()
+
+    if capture_stdout:
+        stats.stdout = process.stdout.read()
+
+    stats.returncode = process.wait()
+    reader.join()
+    stats.elapsed = time.perf_counter() - started
+
+    _write_metrics(stats)
+
+    if stats.returncode != 0:
+        raise FFmpegError(stats, list(log))
+
+    return stats
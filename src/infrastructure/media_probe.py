@@ -0,0 +1,218 @@
+import json
+import os
+import subprocess
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+PROBE_ENTRIES = (
+    "format=duration,start_time,bit_rate:"
+    "stream=index,codec_type,codec_name,profile,pix_fmt,width,height,"
+    "avg_frame_rate,start_time,duration,sample_rate,channels"
+)
+
+
+@dataclass
+class MediaInfo:
+    """ffprobe metadata of one media file, optionally with its frame index"""
+
+    path: str
+    size: int
+    mtime_ns: int
+    format: dict
+    streams: List[dict]
+    # Video frame presentation times, relative to the container start,
+    # and which of them are keyframes
+    frame_times: Optional[np.ndarray] = field(default=None, repr=False)
+    keyframes: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @property
+    def duration(self) -> Optional[float]:
+        return _float(self.format.get("duration"))
+
+    @property
+    def video_stream(self) -> Optional[dict]:
+        return self._first_stream("video")
+
+    @property
+    def audio_stream(self) -> Optional[dict]:
+        return self._first_stream("audio")
+
+    @property
+    def start_time(self) -> float:
+        """Container start, the origin of ffmpeg's -ss and trim times."""
+        return _float(self.format.get("start_time")) or 0.0
+
+    @property
+    def frame_rate(self) -> float:
+        """Average video frame rate, defaulting to 30 fps."""
+        stream = self.video_stream or {}
+        num, _, den = stream.get("avg_frame_rate", "").partition("/")
+
+        try:
+            rate = float(num) / float(den or 1)
+        except (ValueError, ZeroDivisionError):
+            rate = 0.0
+
+        return rate if rate > 0 else 30.0
+
+    @property
+    def keyframe_times(self) -> np.ndarray:
+        return self.frame_times[self.keyframes]
+
+    def _first_stream(self, codec_type: str) -> Optional[dict]:
+        for stream in self.streams:
+            if stream.get("codec_type") == codec_type:
+                return stream
+
+        return None
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _identity(media_path: str) -> dict:
+    stat = os.stat(media_path)
+
+    return {
+        "path": os.path.abspath(media_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def probe_media(
+    media_path: str, cache_dir: str, with_packets: bool = False
+) -> MediaInfo:
+    """
+    Get a media file's metadata, running ffprobe only when it changed.
+
+    The result is cached in cache_dir as probe_<name>.json, and the frame
+    index as probe_<name>_frames.npy, both keyed by the file's path, size
+    and modification time.
+
+    Args:
+        media_path: Path to the media file
+        cache_dir: Folder for the cache files, usually the video's temp
+            folder
+        with_packets: Also load the video frame and keyframe index
+
+    Returns:
+        The file's metadata
+    """
+    identity = _identity(media_path)
+    name = os.path.splitext(os.path.basename(media_path))[0]
+    metadata_path = os.path.join(cache_dir, f"probe_{name}.json")
+    packets_path = os.path.join(cache_dir, f"probe_{name}_frames.npy")
+
+    cached = None
+
+    if os.path.exists(metadata_path):
+        with open(metadata_path, encoding="utf-8") as f:
+            cached = json.load(f)
+
+        if cached.get("identity") != identity:
+            cached = None
+
+    if cached is None:
+        cached = {"identity": identity, **_run_ffprobe(media_path)}
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(cached, f, indent=2)
+
+        # A stale frame index belongs to the previous version of the file
+        if os.path.exists(packets_path):
+            os.remove(packets_path)
+
+    info = MediaInfo(
+        **identity,
+        format=cached.get("format", {}),
+        streams=cached.get("streams", []),
+    )
+
+    if with_packets and info.video_stream is not None:
+        if os.path.exists(packets_path):
+            packets = np.load(packets_path)
+        else:
+            packets = _probe_packets(media_path, info.start_time)
+            np.save(packets_path, packets)
+
+        info.frame_times = packets[0]
+        info.keyframes = packets[1].astype(bool)
+
+    return info
+
+
+def _run_ffprobe(media_path: str) -> dict:
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            PROBE_ENTRIES,
+            "-of",
+            "json",
+            media_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return json.loads(result.stdout)
+
+
+def _probe_packets(media_path: str, start_time: float) -> np.ndarray:
+    """
+    Read the presentation time and keyframe flag of every video packet.
+
+    Only packet headers are read, so this is fast even for long videos.
+    Times are made relative to the container start rather than the video
+    stream's, as ffmpeg's -ss and trim are; the two differ when audio and
+    video start at different times.
+
+    Returns:
+        2 x N array of times in seconds relative to start_time, sorted,
+        and 1.0 where the frame is a keyframe
+    """
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "packet=pts_time,flags",
+            "-of",
+            "csv=print_section=0",
+            media_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = []
+    keyframes = []
+
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(",")
+        if pts_time not in ("", "N/A"):
+            times.append(float(pts_time))
+            keyframes.append("K" in flags)
+
+    packets = np.array([times, keyframes], dtype=np.float64).reshape(2, -1)
+    packets[0] -= start_time
+
+    # Packets come in decode order; B-frames make that differ from
+    # presentation order
+    return packets[:, np.argsort(packets[0], kind="stable")]
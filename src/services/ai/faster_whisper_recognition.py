@@ -0,0 +1,81 @@
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    from faster_whisper import BatchedInferencePipeline, WhisperModel
+except ImportError:
+    BatchedInferencePipeline = WhisperModel = None
+
+
+class FasterWhisperSpeechRecognition:
+    """Whisper on CTranslate2, quantized for CPU inference"""
+
+    def __init__(
+        self,
+        model_size: str = "large-v3",
+        language: str = "pt",
+        compute_type: str = "int8",
+        batch_size: int = 8,
+    ):
+        if WhisperModel is None:
+            raise ImportError(
+                "ASR_BACKEND=faster-whisper requires faster-whisper: "
+                "pip install faster-whisper"
+            )
+
+        self.language = language
+        self.batch_size = max(batch_size, 1)
+        self.model = WhisperModel(
+            model_size, device="cpu", compute_type=compute_type
+        )
+
+    def get_audio_transcription(self, audio: np.ndarray) -> Optional[dict]:
+        """Transcribe one segment; None if recognition failed."""
+        try:
+            segments, _ = self.model.transcribe(
+                audio,
+                language=self.language,
+                task="transcribe",
+                temperature=0.0,
+                beam_size=5,
+                without_timestamps=True,
+            )
+
+            return {"text": " ".join(seg.text.strip() for seg in segments)}
+        except Exception as e:
+            print(f"Error transcribing segment. Error: {e}")
+
+            return None
+
+    def transcribe(self, audio_segments: List) -> List:
+        # CTranslate2 already spreads each call over the CPU cores
+        return [
+            self.get_audio_transcription(audio) for audio in audio_segments
+        ]
+
+    def transcribe_words(self, audio: np.ndarray) -> List:
+        """
+        Transcribe long audio in batched 30 second chunks
+
+        Args:
+            audio: 16 kHz mono float32 samples
+
+        Returns:
+            List of {"start", "end", "text"} words in seconds
+        """
+        pipeline = BatchedInferencePipeline(model=self.model)
+
+        segments, _ = pipeline.transcribe(
+            audio,
+            language=self.language,
+            task="transcribe",
+            batch_size=self.batch_size,
+            word_timestamps=True,
+        )
+
+        return [
+            {"start": word.start, "end": word.end, "text": word.word}
+            for segment in segments
+            for word in segment.words or []
+        ]
@@ -1,27 +1,48 @@
-from concurrent.futures import ThreadPoolExecutor
-from typing import List
+from typing import List, Optional, Union
 import warnings
 
+import numpy as np
 import torch
 from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
 
+from src.services.audio.pcm import SAMPLE_RATE
+
 warnings.filterwarnings("ignore", category=FutureWarning)
 
+# Whisper's encoder always sees a 30 second window
+WHISPER_WINDOW_SAMPLES = 30 * SAMPLE_RATE
+
 
 class SpeechRecognition:
-    def __init__(self):
-        device = "cuda:0" if torch.cuda.is_available() else "cpu"
-        torch_dtype = (
+    """Whisper through the transformers pipeline"""
+
+    def __init__(
+        self,
+        model_size: str = "large-v3",
+        language: str = "pt",
+        batch_size: int = 8,
+        quantize: bool = False,
+    ):
+        self.language = language
+        self.batch_size = max(batch_size, 1)
+        self.device = "cuda:0" if torch.cuda.is_available() else "cpu"
+        self.torch_dtype = (
             torch.float16 if torch.cuda.is_available() else torch.float32
         )
 
-        model_id = "openai/whisper-large-v3"
+        model_id = f"openai/whisper-{model_size}"
 
         self.model = AutoModelForSpeechSeq2Seq.from_pretrained(
             model_id,
-            torch_dtype=torch_dtype,
+            torch_dtype=self.torch_dtype,
             use_safetensors=True,
-        ).to(device)
+        ).to(self.device)
+
+        if quantize and self.device == "cpu":
+            # int8 weights for every Linear layer, activations stay float
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
 
         self.processor = AutoProcessor.from_pretrained(model_id)
 
@@ -30,18 +51,25 @@ class SpeechRecognition:
             model=self.model,
             tokenizer=self.processor.tokenizer,
             feature_extractor=self.processor.feature_extractor,
-            torch_dtype=torch_dtype,
-            device=device,
+            torch_dtype=self.torch_dtype,
+            device=self.device,
             model_kwargs={"use_cache": True},
         )
 
-    def get_audio_transcription(self, audio_path: str) -> dict:
+    def get_audio_transcription(
+        self, audio: Union[str, np.ndarray]
+    ) -> Optional[dict]:
+        """Transcribe one segment; None if recognition failed."""
         try:
+            if isinstance(audio, np.ndarray):
+                # 16 kHz mono float32 samples, already decoded
+                audio = {"raw": audio, "sampling_rate": SAMPLE_RATE}
+
             response = self.whisper_pipeline(
-                audio_path,
+                audio,
                 batch_size=1,
                 generate_kwargs={
-                    "language": "portuguese",
+                    "language": self.language,
                     "task": "transcribe",
                     "temperature": 0.0,
                 },
@@ -49,17 +77,177 @@ class SpeechRecognition:
 
             return response
         except Exception as e:
-            print(f"Error transcribing segment: {audio_path}. Error: {e}")
+            print(f"Error transcribing segment. Error: {e}")
 
-            return {"text": ""}
+            return None
 
-    def transcribe(self, audio_segments_path: List) -> List:
-        with ThreadPoolExecutor() as executor:
-            results = list(
-                executor.map(
-                    self.get_audio_transcription,
-                    audio_segments_path,
-                )
+    def transcribe_batch(self, audio_segments: List[np.ndarray]) -> List:
+        """
+        Transcribe several short segments in one generate call
+
+        Args:
+            audio_segments: 16 kHz mono float32 arrays up to 30 seconds
+
+        Returns:
+            List of {"text"} results in the same order
+        """
+        inputs = self.processor.feature_extractor(
+            audio_segments,
+            sampling_rate=SAMPLE_RATE,
+            return_tensors="pt",
+            return_attention_mask=True,
+        )
+
+        with torch.no_grad():
+            generated_ids = self.model.generate(
+                inputs.input_features.to(self.device, self.torch_dtype),
+                attention_mask=inputs.attention_mask.to(self.device),
+                language=self.language,
+                task="transcribe",
+                temperature=0.0,
             )
 
+        texts = self.processor.batch_decode(
+            generated_ids, skip_special_tokens=True
+        )
+
+        return [{"text": text} for text in texts]
+
+    def transcribe_words(self, audio: np.ndarray) -> List:
+        """
+        Transcribe long audio in batched 30 second chunks
+
+        Args:
+            audio: 16 kHz mono float32 samples
+
+        Returns:
+            List of {"start", "end", "text"} words in seconds
+        """
+        response = self.whisper_pipeline(
+            {"raw": audio, "sampling_rate": SAMPLE_RATE},
+            chunk_length_s=30,
+            batch_size=self.batch_size,
+            return_timestamps="word",
+            generate_kwargs={
+                "language": self.language,
+                "task": "transcribe",
+            },
+        )
+
+        words = []
+
+        for chunk in response.get("chunks", []):
+            start, end = chunk["timestamp"]
+
+            if start is None:
+                continue
+
+            # The final word can come back without an end time
+            words.append(
+                {
+                    "start": start,
+                    "end": end if end is not None else start,
+                    "text": chunk["text"],
+                }
+            )
+
+        return words
+
+    def transcribe(self, audio_segments: List) -> List:
+        """
+        Transcribe segments in length-bucketed batches
+
+        Segments are sorted by duration so each batch holds similar
+        lengths, which keeps decoder steps per batch close. Segments
+        longer than Whisper's window go through the pipeline one by one.
+
+        Args:
+            audio_segments: 16 kHz mono float32 arrays
+
+        Returns:
+            List of {"text"} results in the original order, None where
+            recognition failed
+        """
+        results: List = [None] * len(audio_segments)
+
+        lengths = np.array([len(audio) for audio in audio_segments])
+        order = np.argsort(lengths, kind="stable")
+
+        short = order[lengths[order] <= WHISPER_WINDOW_SAMPLES].tolist()
+        long = order[lengths[order] > WHISPER_WINDOW_SAMPLES].tolist()
+
+        for start in range(0, len(short), self.batch_size):
+            end = start + self.batch_size
+            bucket = short[start:end]
+
+            try:
+                batch_results = self.transcribe_batch(
+                    [audio_segments[i] for i in bucket]
+                )
+            except Exception as e:
+                print(f"Error transcribing batch, retrying one by one: {e}")
+
+                batch_results = [
+                    self.get_audio_transcription(audio_segments[i])
+                    for i in bucket
+                ]
+
+            for i, result in zip(bucket, batch_results):
+                results[i] = result
+
+        for i in long:
+            results[i] = self.get_audio_transcription(audio_segments[i])
+
         return results
+
+
+def create_speech_recognition(settings):
+    """
+    Build the speech recognition backend selected in settings
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Backend exposing transcribe(audio_segments) -> List[{"text"}],
+        with None for segments it failed to recognize
+    """
+    if settings.asr_workers > 1:
+        from src.services.ai.speech_recognition_pool import (
+            SpeechRecognitionPool,
+        )
+
+        return SpeechRecognitionPool(
+            settings,
+            workers=settings.asr_workers,
+            threads_per_worker=settings.asr_threads_per_worker,
+        )
+
+    return create_local_speech_recognition(settings)
+
+
+def create_local_speech_recognition(settings):
+    """Build the configured backend in the current process."""
+    backend = settings.asr_backend
+
+    if backend == "faster-whisper":
+        from src.services.ai.faster_whisper_recognition import (
+            FasterWhisperSpeechRecognition,
+        )
+
+        return FasterWhisperSpeechRecognition(
+            model_size=settings.asr_model_size,
+            language=settings.asr_language,
+            compute_type=settings.asr_compute_type,
+            batch_size=settings.asr_batch_size,
+        )
+
+    if backend in ("transformers", "transformers-int8"):
+        return SpeechRecognition(
+            model_size=settings.asr_model_size,
+            language=settings.asr_language,
+            batch_size=settings.asr_batch_size,
+            quantize=backend == "transformers-int8",
+        )
+
+    raise ValueError(f"Unknown ASR backend: {backend}")
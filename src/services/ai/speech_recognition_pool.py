@@ -0,0 +1,164 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List
+
+import numpy as np
+import torch
+
+# Per-process state of the pool workers
+_worker_recognizer = None
+_worker_buffers = {}
+
+
+def _init_worker(settings, threads: int) -> None:
+    global _worker_recognizer
+
+    from src.services.ai.speech_recognition import (
+        create_local_speech_recognition,
+    )
+
+    # Each worker gets its own slice of the cores
+    torch.set_num_threads(threads)
+    _worker_recognizer = create_local_speech_recognition(settings)
+
+
+def _attach(name: str, size: int) -> np.ndarray:
+    if name not in _worker_buffers:
+        # Drop buffers of earlier jobs, the parent has unlinked them
+        for buffer in _worker_buffers.values():
+            buffer.close()
+        _worker_buffers.clear()
+
+        # Pool workers share the parent's resource tracker, which unlinks
+        # the block exactly once when the parent does
+        _worker_buffers[name] = shared_memory.SharedMemory(name=name)
+
+    buffer = _worker_buffers[name]
+
+    return np.ndarray((size,), dtype=np.float32, buffer=buffer.buf)
+
+
+def _transcribe_task(task: tuple) -> List:
+    name, size, spans = task
+    audio = _attach(name, size)
+
+    segments = [audio[offset:][:length] for _, offset, length in spans]
+    results = _worker_recognizer.transcribe(segments)
+
+    return [(index, result) for (index, _, _), result in zip(spans, results)]
+
+
+def _transcribe_words_task(task: tuple) -> List:
+    name, size = task
+
+    return _worker_recognizer.transcribe_words(_attach(name, size))
+
+
+class SpeechRecognitionPool:
+    """
+    Speech recognition spread over worker processes
+
+    Segment audio is copied once into a shared memory block; workers read
+    their spans from it instead of receiving pickled arrays. Each worker
+    loads its own model and uses a fixed number of torch threads.
+    """
+
+    def __init__(self, settings, workers: int, threads_per_worker: int):
+        self.settings = settings
+        self.workers = workers
+        self.threads_per_worker = max(threads_per_worker, 1)
+        self.batch_size = max(settings.asr_batch_size, 1)
+        self.executor = None
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        # Workers outlive a single job so models are loaded only once
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.settings, self.threads_per_worker),
+            )
+
+        return self.executor
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def transcribe(self, audio_segments: List) -> List:
+        """
+        Transcribe segments across the worker processes
+
+        Args:
+            audio_segments: 16 kHz mono float32 arrays
+
+        Returns:
+            List of {"text"} results in the original order, None where
+            recognition failed
+        """
+        if not audio_segments:
+            return []
+
+        lengths = np.array([len(audio) for audio in audio_segments])
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        total = int(lengths.sum())
+
+        buffer = shared_memory.SharedMemory(
+            create=True, size=max(total, 1) * 4
+        )
+
+        try:
+            audio = np.ndarray((total,), dtype=np.float32, buffer=buffer.buf)
+
+            for offset, segment in zip(offsets, audio_segments):
+                audio[offset:][: len(segment)] = segment
+
+            # Length-sorted batches keep each worker's batches uniform
+            order = np.argsort(lengths, kind="stable").tolist()
+            tasks = []
+
+            for start in range(0, len(order), self.batch_size):
+                end = start + self.batch_size
+                spans = [
+                    (i, int(offsets[i]), int(lengths[i]))
+                    for i in order[start:end]
+                ]
+                tasks.append((buffer.name, total, spans))
+
+            results: List = [None] * len(audio_segments)
+
+            for batch in self.get_executor().map(_transcribe_task, tasks):
+                for index, result in batch:
+                    results[index] = result
+
+            del audio
+
+            return results
+        finally:
+            buffer.close()
+            buffer.unlink()
+
+    def transcribe_words(self, audio: np.ndarray) -> List:
+        """Long-form transcription on one worker, via shared memory."""
+        audio = np.asarray(audio, dtype=np.float32)
+
+        buffer = shared_memory.SharedMemory(
+            create=True, size=max(len(audio), 1) * 4
+        )
+
+        try:
+            shared = np.ndarray(
+                (len(audio),), dtype=np.float32, buffer=buffer.buf
+            )
+            shared[:] = audio
+            del shared
+
+            future = self.get_executor().submit(
+                _transcribe_words_task, (buffer.name, len(audio))
+            )
+
+            return future.result()
+        finally:
+            buffer.close()
+            buffer.unlink()
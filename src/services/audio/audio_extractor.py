@@ -1,11 +1,36 @@
 import os
 import json
-import subprocess
-from typing import List
+from typing import Iterator, List
 
+import numpy as np
 import torchaudio
 import torch
 
+from src.core.timeline import Timeline
+from src.infrastructure.ffmpeg import atomic_output, run_ffmpeg
+from src.infrastructure.media_probe import probe_media
+from src.services.audio.pcm import (
+    PCM_EXTENSION,
+    SAMPLE_RATE,
+    is_pcm_file,
+    load_pcm,
+    to_float32,
+)
+from src.services.audio.segmentation import (
+    SegmentationParams,
+    compute_speech_probabilities,
+    iter_merged_segments,
+    load_speech_probabilities,
+    segment_probabilities,
+    sweep,
+)
+from src.services.audio.vad import (
+    VAD_FRAME_SIZE,
+    SileroVAD,
+    iter_pcm_windows,
+    parallel_speech_timestamps,
+    stream_speech_timestamps,
+)
 from src.utils import (
     get_file_name,
     check_or_create_folder,
@@ -21,22 +46,46 @@ class AudioExtractorService:
         self.settings = settings
         self.file_name: str = ""
         self.folder_path: str = ""
-        self.gap_threshold: float = 1.0
-        self.max_segment_length: float = 5.0
-
-        # Load Silero VAD model
-        self.model, utils = torch.hub.load(
-            repo_or_dir="snakers4/silero-vad",
-            model="silero_vad",
-            force_reload=True,
+        self.gap_threshold: float = settings.segment_gap_threshold
+        self.max_segment_length: float = settings.max_segment_length
+
+        # Silero VAD is only loaded once VAD actually has to run
+        self.vad = SileroVAD(settings)
+
+    def get_audio_path(self, video_path: str) -> str:
+        """Where the audio of a video is extracted and cached."""
+        file_name = get_file_name(video_path)
+        is_pcm = self.settings.audio_format == "pcm"
+        extension = PCM_EXTENSION if is_pcm else ".mp3"
+
+        return os.path.join(
+            self.settings.temp_dir, file_name, "audio", file_name + extension
         )
-        (
-            self.get_speech_timestamps,
-            self.save_audio,
-            self.read_audio,
-            _,
-            _,
-        ) = utils
+
+    @property
+    def audio_codec_args(self) -> List[str]:
+        """ffmpeg output options producing the configured audio format."""
+        if self.settings.audio_format == "pcm":
+            # Decode once to the format VAD and Whisper consume
+            return [
+                "-ac",
+                "1",  # Mono
+                "-ar",
+                str(SAMPLE_RATE),
+                "-f",
+                "s16le",  # Raw PCM, no container
+                "-acodec",
+                "pcm_s16le",
+            ]
+
+        return [
+            "-acodec",
+            "libmp3lame",  # MP3 codec
+            "-q:a",
+            "2",  # Quality setting
+            "-f",
+            "mp3",
+        ]
 
     def extract_audio(self, video_path: str) -> str:
         """
@@ -54,12 +103,8 @@ class AudioExtractorService:
         print("    -> Extracting audio...")
 
         self.file_name = get_file_name(video_path)
-        self.folder_path = os.path.join(
-            self.settings.temp_dir, self.file_name, "audio"
-        )
-
-        audio_filename = self.file_name + ".mp3"
-        audio_path = os.path.join(self.folder_path, audio_filename)
+        audio_path = self.get_audio_path(video_path)
+        self.folder_path = os.path.dirname(audio_path)
 
         # Check if audio has already been extracted
         if os.path.exists(audio_path):
@@ -69,27 +114,162 @@ class AudioExtractorService:
 
         check_or_create_folder(self.folder_path)
 
-        # Extract audio from video using ffmpeg
-        ffmpeg_cmd = [
-            "ffmpeg",
-            "-y",
-            "-i",
-            video_path,
-            "-vn",  # No video
-            "-acodec",
-            "libmp3lame",  # MP3 codec
-            "-q:a",
-            "2",  # Quality setting
-            "-loglevel",
-            "quiet",  # Suppress logs
-            audio_path,
-        ]
+        # Probed once here and cached for the editor
+        media = probe_media(
+            video_path, os.path.join(self.settings.temp_dir, self.file_name)
+        )
+
+        if media.audio_stream is None:
+            raise ValueError(f"Video has no audio stream: {video_path}")
+
+        with atomic_output(audio_path) as partial_path:
+            # Extract audio from video using ffmpeg
+            ffmpeg_cmd = [
+                "ffmpeg",
+                "-y",
+                "-i",
+                video_path,
+                "-vn",  # No video
+                *self.audio_codec_args,
+                "-loglevel",
+                "error",  # Only what explains a failure
+                partial_path,
+            ]
+
+            run_ffmpeg(ffmpeg_cmd, label="extract_audio")
 
-        subprocess.run(ffmpeg_cmd, check=True)
         print("      -> Audio extracted successfully.")
 
         return audio_path
 
+    @staticmethod
+    def load_waveform(audio_path: str) -> torch.Tensor:
+        """
+        Load an audio artifact as a 16 kHz mono float32 tensor
+
+        Args:
+            audio_path: Path to the audio file
+
+        Returns:
+            1-D waveform tensor
+        """
+        if is_pcm_file(audio_path):
+            # Already 16 kHz mono, no decode or resample needed
+            return torch.from_numpy(to_float32(load_pcm(audio_path)))
+
+        # Load audio using torchaudio
+        wav, sr = torchaudio.load(audio_path)
+
+        # Convert to mono if stereo
+        if wav.shape[0] > 1:
+            wav = torch.mean(wav, dim=0)
+
+        # Resample to 16kHz if needed
+        if sr != SAMPLE_RATE:
+            resampler = torchaudio.transforms.Resample(sr, SAMPLE_RATE)
+            wav = resampler(wav)
+
+        return wav
+
+    @property
+    def segmentation_params(self) -> SegmentationParams:
+        return SegmentationParams(
+            threshold=self.settings.vad_threshold,
+            gap_threshold=self.gap_threshold,
+            max_segment_length=self.max_segment_length,
+        )
+
+    def get_speech_probabilities(self, audio_path: str) -> np.ndarray:
+        """
+        Load per-frame speech probabilities, running VAD only once
+
+        The cache file is named after the VAD backend and model version,
+        since probabilities from another model don't match its thresholds.
+
+        Args:
+            audio_path: Path to the audio file
+
+        Returns:
+            Memory-mapped probabilities stored next to the audio
+        """
+        probabilities_path = os.path.join(
+            os.path.dirname(audio_path),
+            f"vad_probabilities_{self.settings.vad_backend}_"
+            f"{self.settings.vad_model_version}.npy",
+        )
+
+        if os.path.exists(probabilities_path):
+            return load_speech_probabilities(probabilities_path)
+
+        window_size = self.get_vad_window_size()
+
+        return compute_speech_probabilities(
+            self.vad.model,
+            iter_pcm_windows(audio_path, window_size, pad=False),
+            probabilities_path,
+        )
+
+    def sweep_raw_segments(
+        self, audio_path: str, param_sets: List[SegmentationParams]
+    ) -> List[List]:
+        """
+        Segment the audio with several parameter sets at once
+
+        Args:
+            audio_path: Path to the audio file
+            param_sets: Segmentation parameters to try
+
+        Returns:
+            One list of speech segments per parameter set
+        """
+        return sweep(self.get_speech_probabilities(audio_path), param_sets)
+
+    def get_vad_window_size(self) -> int:
+        # Whole VAD frames per window keep the iterator state aligned
+        frames = SAMPLE_RATE * self.settings.vad_window_seconds
+
+        return max(frames // VAD_FRAME_SIZE, 1) * VAD_FRAME_SIZE
+
+    def get_speech_timestamps_for(self, audio_path: str) -> List:
+        """
+        Run VAD over an audio file using the configured mode
+
+        Args:
+            audio_path: Path to the audio file
+
+        Returns:
+            List of speech timestamps in samples
+        """
+        if self.settings.vad_mode == "streaming":
+            window_size = self.get_vad_window_size()
+
+            return list(
+                stream_speech_timestamps(
+                    self.vad.model,
+                    self.vad.vad_iterator,
+                    iter_pcm_windows(audio_path, window_size),
+                )
+            )
+
+        if self.settings.vad_mode == "parallel":
+            if is_pcm_file(audio_path):
+                return parallel_speech_timestamps(
+                    self.settings,
+                    audio_path,
+                    workers=self.settings.vad_workers,
+                    chunk_seconds=self.settings.vad_chunk_seconds,
+                    overlap_seconds=self.settings.vad_overlap_seconds,
+                )
+
+            print("      -> Parallel VAD needs PCM audio - running in full.")
+
+        wav = self.load_waveform(audio_path)
+
+        # Get speech timestamps
+        return self.vad.get_speech_timestamps(
+            wav, self.vad.model, sampling_rate=SAMPLE_RATE
+        )
+
     def extract_raw_segments(self, audio_path: str) -> List:
         """
         Extract speech segments from an audio file
@@ -106,6 +286,23 @@ class AudioExtractorService:
             self.folder_path, "raw_speech_segments.json"
         )
 
+        if self.settings.vad_mode == "probabilities":
+            # Re-segmenting cached probabilities takes milliseconds, so
+            # parameter changes are always picked up
+            combined_segments = segment_probabilities(
+                self.get_speech_probabilities(audio_path),
+                self.segmentation_params,
+            )
+
+            save_to_file(
+                raw_speech_segments_file_path,
+                json.dumps(combined_segments, ensure_ascii=False, indent=2),
+            )
+
+            print("      -> Raw speech segments extracted successfully.")
+
+            return combined_segments
+
         if os.path.exists(raw_speech_segments_file_path):
             try:
                 speech_segments = read_from_json_file(
@@ -123,56 +320,65 @@ class AudioExtractorService:
             except json.decoder.JSONDecodeError:
                 pass
 
-        # Load audio using torchaudio
-        wav, sr = torchaudio.load(audio_path)
+        speech_timestamps = self.get_speech_timestamps_for(audio_path)
 
-        # Convert to mono if stereo
-        if wav.shape[0] > 1:
-            wav = torch.mean(wav, dim=0)
+        # Convert from samples to seconds
+        starts = np.array([ts["start"] for ts in speech_timestamps])
+        ends = np.array([ts["end"] for ts in speech_timestamps])
+        timeline = Timeline(starts / SAMPLE_RATE, ends / SAMPLE_RATE)
 
-        # Resample to 16kHz if needed
-        if sr != 16000:
-            resampler = torchaudio.transforms.Resample(sr, 16000)
-            wav = resampler(wav)
+        combined_segments = timeline.merge(
+            gap_threshold=self.gap_threshold,
+            max_segment_length=self.max_segment_length,
+        ).to_segments()
 
-        # Get speech timestamps
-        speech_timestamps = self.get_speech_timestamps(
-            wav, self.model, sampling_rate=16000
+        save_to_file(
+            raw_speech_segments_file_path,
+            json.dumps(combined_segments, ensure_ascii=False, indent=2),
         )
 
-        segments = []
-        for ts in speech_timestamps:
-            start_sec = ts["start"] / 16000  # Convert from samples to seconds
-            end_sec = ts["end"] / 16000  # Convert from samples to seconds
-            segments.append({"start": start_sec, "end": end_sec})
+        print("      -> Raw speech segments extracted successfully.")
+
+        return combined_segments
+
+    def iter_raw_segments(self, audio_path: str) -> Iterator[dict]:
+        """
+        Yield speech segments as soon as VAD closes them
+
+        Only the streaming VAD mode produces segments incrementally; other
+        modes (and cached results) yield the full list once it is ready.
+
+        Args:
+            audio_path: Path to the audio file
+
+        Yields:
+            Speech segments in seconds
+        """
+        raw_speech_segments_file_path = os.path.join(
+            self.folder_path, "raw_speech_segments.json"
+        )
+
+        if self.settings.vad_mode != "streaming" or os.path.exists(
+            raw_speech_segments_file_path
+        ):
+            yield from self.extract_raw_segments(audio_path)
+            return
+
+        print("    -> Extracting raw segments...")
+
+        timestamps = stream_speech_timestamps(
+            self.vad.model,
+            self.vad.vad_iterator,
+            iter_pcm_windows(audio_path, self.get_vad_window_size()),
+        )
 
         combined_segments = []
-        current_segment = None
-
-        for seg in segments:
-            if not current_segment:
-                # If there's no "active" segment to merge into, start a new one
-                current_segment = seg
-            else:
-                gap = seg["start"] - current_segment["end"]
-                merged_length = seg["end"] - current_segment["start"]
-
-                # If gap is small enough AND the merged length won't
-                # exceed the limit, merge
-                if (
-                    gap < self.gap_threshold
-                    and merged_length <= self.max_segment_length
-                ):
-                    # Extend the current segment to the new end time
-                    current_segment["end"] = seg["end"]
-                else:
-                    # Otherwise, push the old one and start a new segment
-                    combined_segments.append(current_segment)
-                    current_segment = seg
-
-        # Append the last segment if it exists
-        if current_segment:
-            combined_segments.append(current_segment)
+
+        for segment in iter_merged_segments(
+            timestamps, self.gap_threshold, self.max_segment_length
+        ):
+            combined_segments.append(segment)
+            yield segment
 
         save_to_file(
             raw_speech_segments_file_path,
@@ -180,5 +386,3 @@ class AudioExtractorService:
         )
 
         print("      -> Raw speech segments extracted successfully.")
-
-        return combined_segments
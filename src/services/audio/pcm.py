@@ -0,0 +1,95 @@
+from typing import List
+
+import numpy as np
+
+from src.infrastructure.ffmpeg import run_ffmpeg
+
+SAMPLE_RATE = 16000
+PCM_EXTENSION = ".pcm"
+
+
+def is_pcm_file(audio_path: str) -> bool:
+    """Check whether an audio artifact is a raw 16 kHz mono s16le file."""
+    return audio_path.lower().endswith(PCM_EXTENSION)
+
+
+def load_pcm(audio_path: str) -> np.ndarray:
+    """
+    Memory-map a raw 16 kHz mono s16le file.
+
+    Args:
+        audio_path: Path to the raw PCM file
+
+    Returns:
+        Read-only int16 array backed by the file on disk
+    """
+    return np.memmap(audio_path, dtype=np.int16, mode="r")
+
+
+def to_float32(samples: np.ndarray) -> np.ndarray:
+    """Convert int16 PCM samples to float32 in the [-1, 1] range."""
+    return np.asarray(samples, dtype=np.float32) / 32768.0
+
+
+def decode_command(audio_path: str) -> List[str]:
+    """ffmpeg command decoding any audio to 16 kHz mono s16le on stdout."""
+    return [
+        "ffmpeg",
+        "-i",
+        audio_path,
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-f",
+        "s16le",
+        "-loglevel",
+        "error",
+        "pipe:1",
+    ]
+
+
+def read_pcm(audio_path: str) -> np.ndarray:
+    """
+    Get 16 kHz mono int16 samples for any audio artifact.
+
+    Raw PCM is memory-mapped; other formats are decoded once by ffmpeg.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        int16 sample array
+    """
+    if is_pcm_file(audio_path):
+        return load_pcm(audio_path)
+
+    stats = run_ffmpeg(
+        decode_command(audio_path), label="decode_audio", capture_stdout=True
+    )
+
+    return np.frombuffer(stats.stdout, dtype=np.int16)
+
+
+def slice_segments(samples: np.ndarray, timeline) -> List[np.ndarray]:
+    """
+    Cut float32 audio for each timeline segment by sample index.
+
+    Args:
+        samples: 16 kHz mono int16 samples
+        timeline: Timeline with segment times in seconds
+
+    Returns:
+        One float32 array per segment
+    """
+    starts = np.round(timeline.starts * SAMPLE_RATE).astype(np.int64)
+    ends = np.round(timeline.ends * SAMPLE_RATE).astype(np.int64)
+
+    starts = np.clip(starts, 0, len(samples))
+    ends = np.clip(ends, starts, len(samples))
+
+    return [
+        to_float32(samples[start:end])
+        for start, end in zip(starts.tolist(), ends.tolist())
+    ]
@@ -0,0 +1,232 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+from src.core.timeline import Timeline
+from src.services.audio.pcm import SAMPLE_RATE
+from src.services.audio.vad import VAD_FRAME_SIZE
+
+FRAME_SECONDS = VAD_FRAME_SIZE / SAMPLE_RATE
+
+
+@dataclass(frozen=True)
+class SegmentationParams:
+    """Parameters turning per-frame speech probabilities into segments"""
+
+    threshold: float = 0.5
+    # Probability under which speech ends; threshold - 0.15 when unset,
+    # like Silero
+    neg_threshold: Optional[float] = None
+    min_speech_duration_ms: int = 250
+    min_silence_duration_ms: int = 100
+    speech_pad_ms: int = 30
+    gap_threshold: float = 1.0
+    max_segment_length: float = 5.0
+
+    @property
+    def end_threshold(self) -> float:
+        if self.neg_threshold is not None:
+            return self.neg_threshold
+
+        return max(self.threshold - 0.15, 0.01)
+
+
+def compute_speech_probabilities(
+    model, windows: Iterator[np.ndarray], probabilities_path: str
+) -> np.ndarray:
+    """
+    Run Silero VAD once and keep its per-frame speech probabilities.
+
+    Probabilities are stored as float16 .npy (about 60 KB per audio minute)
+    and returned memory-mapped, so segmentation can be re-run later without
+    touching the model again. A short last window is zero-padded to whole
+    frames only, so no frame lies entirely past the end of the audio.
+
+    Args:
+        model: Loaded Silero VAD model
+        windows: float32 windows whose size is a multiple of 512 samples,
+            except possibly the last one
+        probabilities_path: Where to save the .npy file
+
+    Returns:
+        Memory-mapped array with one probability per 512-sample frame
+    """
+    model.reset_states()
+    probabilities = []
+
+    with torch.no_grad():
+        for window in windows:
+            padding = -len(window) % VAD_FRAME_SIZE
+            window = np.pad(window, (0, padding))
+
+            for frame in np.split(window, len(window) // VAD_FRAME_SIZE):
+                probability = model(torch.from_numpy(frame), SAMPLE_RATE)
+                probabilities.append(probability.item())
+
+    model.reset_states()
+
+    np.save(probabilities_path, np.asarray(probabilities, dtype=np.float16))
+
+    return load_speech_probabilities(probabilities_path)
+
+
+def load_speech_probabilities(probabilities_path: str) -> np.ndarray:
+    """Memory-map cached per-frame speech probabilities."""
+    return np.load(probabilities_path, mmap_mode="r")
+
+
+def speech_regions(
+    probabilities: np.ndarray, params: SegmentationParams
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Threshold probabilities into speech regions, vectorized.
+
+    Follows the rules of Silero's get_speech_timestamps: speech starts on a
+    frame at or above threshold and lasts until the probability drops under
+    end_threshold, silences shorter than the minimum are bridged, short
+    regions are dropped and the rest are padded, splitting the difference
+    where padding would make neighbours overlap. Unlike Silero, a silence
+    is bridged even if a frame inside it rises back between the two
+    thresholds, and the audio end is only known to the frame, so the last
+    region may be padded up to 32 ms past it.
+
+    Args:
+        probabilities: Per-frame speech probabilities
+        params: Segmentation parameters
+
+    Returns:
+        Start and end arrays in seconds
+    """
+    probabilities = np.asarray(probabilities)
+    active = probabilities >= params.end_threshold
+    triggers = np.flatnonzero(probabilities >= params.threshold)
+
+    # Runs of frames above end_threshold are speech from their first frame
+    # reaching threshold; runs that never reach it are not speech
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], active, [0]))))
+    run_starts, run_ends = edges[0::2], edges[1::2]
+
+    first = np.searchsorted(triggers, run_starts)
+    triggered = first < len(triggers)
+    triggered[triggered] = triggers[first[triggered]] < run_ends[triggered]
+
+    starts = triggers[first[triggered]]
+    ends = run_ends[triggered]
+
+    if len(starts) > 1:
+        min_silence = params.min_silence_duration_ms / 1000 / FRAME_SECONDS
+        keep = (starts[1:] - ends[:-1]) >= min_silence
+        starts = np.concatenate((starts[:1], starts[1:][keep]))
+        ends = np.concatenate((ends[:-1][keep], ends[-1:]))
+
+    min_speech = params.min_speech_duration_ms / 1000 / FRAME_SECONDS
+    long_enough = (ends - starts) >= min_speech
+
+    duration = len(probabilities) * FRAME_SECONDS
+    pad = params.speech_pad_ms / 1000
+
+    starts = np.maximum(starts[long_enough] * FRAME_SECONDS - pad, 0.0)
+    ends = np.minimum(ends[long_enough] * FRAME_SECONDS + pad, duration)
+
+    overlap = ends[:-1] > starts[1:]
+    midpoints = (ends[:-1] + starts[1:]) / 2
+    ends[:-1] = np.where(overlap, midpoints, ends[:-1])
+    starts[1:] = np.where(overlap, midpoints, starts[1:])
+
+    return starts, ends
+
+
+def iter_merged_segments(
+    timestamps: Iterator[dict],
+    gap_threshold: float,
+    max_segment_length: float,
+) -> Iterator[dict]:
+    """
+    Merge speech timestamps incrementally, as they arrive.
+
+    Same rule and result as Timeline.merge, but each segment is yielded as
+    soon as the next region shows it cannot grow any further.
+
+    Args:
+        timestamps: Speech timestamps in samples, sorted
+        gap_threshold: Largest gap (seconds) that can be merged over
+        max_segment_length: Longest merged segment (seconds)
+
+    Yields:
+        {"start", "end"} segments in seconds
+    """
+    current = None
+
+    for ts in timestamps:
+        start = ts["start"] / SAMPLE_RATE
+        end = ts["end"] / SAMPLE_RATE
+
+        if current is None:
+            current = {"start": start, "end": end}
+        elif (
+            start - current["end"] < gap_threshold
+            and end - current["start"] <= max_segment_length
+        ):
+            current["end"] = end
+        else:
+            yield current
+            current = {"start": start, "end": end}
+
+    if current is not None:
+        yield current
+
+
+def segment_probabilities(
+    probabilities: np.ndarray, params: SegmentationParams
+) -> List:
+    """Turn cached probabilities into merged {"start", "end"} segments."""
+    starts, ends = speech_regions(probabilities, params)
+
+    return (
+        Timeline(starts, ends)
+        .merge(params.gap_threshold, params.max_segment_length)
+        .to_segments()
+    )
+
+
+def sweep(
+    probabilities: np.ndarray, param_sets: Sequence[SegmentationParams]
+) -> List[List]:
+    """
+    Segment the same probabilities with several parameter sets.
+
+    Thresholding is shared between parameter sets that only differ in the
+    gap/length merge, so trying many merge settings is nearly free.
+
+    Args:
+        probabilities: Per-frame speech probabilities
+        param_sets: Parameter sets to evaluate
+
+    Returns:
+        One segment list per parameter set, in the same order
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float32)
+    regions: Dict[tuple, Tuple[np.ndarray, np.ndarray]] = {}
+    results = []
+
+    for params in param_sets:
+        key = (
+            params.threshold,
+            params.end_threshold,
+            params.min_speech_duration_ms,
+            params.min_silence_duration_ms,
+            params.speech_pad_ms,
+        )
+
+        if key not in regions:
+            regions[key] = speech_regions(probabilities, params)
+
+        starts, ends = regions[key]
+        timeline = Timeline(starts, ends).merge(
+            params.gap_threshold, params.max_segment_length
+        )
+        results.append(timeline.to_segments())
+
+    return results
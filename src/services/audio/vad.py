@@ -0,0 +1,331 @@
+import importlib.util
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Iterable, Iterator, List
+
+import numpy as np
+import torch
+
+from src.services.audio.pcm import (
+    SAMPLE_RATE,
+    decode_command,
+    is_pcm_file,
+    load_pcm,
+    to_float32,
+)
+
+# Silero VAD expects exactly 512 samples per call at 16 kHz
+VAD_FRAME_SIZE = 512
+
+SILERO_REPO = "snakers4/silero-vad"
+
+
+class SileroVAD:
+    """
+    Silero VAD model resolved from a local, versioned cache directory.
+
+    Nothing is loaded until the model is first used, so runs where every
+    stage is cached never pay the load. The repository is downloaded once
+    into settings.vad_model_dir; after that no network access is needed.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._model = None
+        self._utils = None
+
+    @property
+    def repo_dir(self) -> str:
+        # Same layout torch.hub uses, so a manual copy of its cache works
+        owner, name = SILERO_REPO.split("/")
+        version = self.settings.vad_model_version
+
+        return os.path.join(
+            self.settings.vad_model_dir, f"{owner}_{name}_{version}"
+        )
+
+    @property
+    def model(self):
+        self.load()
+        return self._model
+
+    @property
+    def get_speech_timestamps(self):
+        self.load()
+        return self._utils[0]
+
+    @property
+    def vad_iterator(self):
+        self.load()
+        return self._utils[3]
+
+    def load(self) -> None:
+        if self._model is not None:
+            return
+
+        self.ensure_available()
+
+        use_onnx = self.settings.vad_backend == "onnx"
+
+        if use_onnx and importlib.util.find_spec("onnxruntime") is None:
+            raise ImportError(
+                "VAD_BACKEND=onnx requires onnxruntime: "
+                "pip install onnxruntime"
+            )
+
+        self._model, self._utils = torch.hub.load(
+            repo_or_dir=self.repo_dir,
+            model="silero_vad",
+            source="local",
+            onnx=use_onnx,
+            force_onnx_cpu=use_onnx,
+        )
+
+    def ensure_available(self) -> None:
+        """Make sure the pinned release is in the cache, without loading."""
+        if not os.path.isdir(self.repo_dir):
+            self.download()
+
+    def download(self) -> None:
+        """Fetch the pinned Silero release into the local cache."""
+        if self.settings.vad_offline:
+            raise FileNotFoundError(
+                f"Silero VAD not found at {self.repo_dir} and VAD_OFFLINE "
+                "is set. Copy the repository there or unset VAD_OFFLINE."
+            )
+
+        print("      -> Downloading Silero VAD model...")
+
+        os.makedirs(self.settings.vad_model_dir, exist_ok=True)
+
+        previous_hub_dir = torch.hub.get_dir()
+        torch.hub.set_dir(self.settings.vad_model_dir)
+
+        try:
+            torch.hub.load(
+                repo_or_dir=f"{SILERO_REPO}:{self.settings.vad_model_version}",
+                model="silero_vad",
+                trust_repo=True,
+            )
+        finally:
+            torch.hub.set_dir(previous_hub_dir)
+
+
+# Per-process model used by the parallel VAD workers
+_worker_vad = None
+
+
+def _init_vad_worker(settings) -> None:
+    global _worker_vad
+
+    # Parallelism comes from the pool; one intra-op thread per worker
+    torch.set_num_threads(1)
+    _worker_vad = SileroVAD(settings)
+
+
+def _detect_window(task: tuple) -> List:
+    audio_path, start, end = task
+
+    wav = torch.from_numpy(to_float32(load_pcm(audio_path)[start:end]))
+    timestamps = _worker_vad.get_speech_timestamps(
+        wav, _worker_vad.model, sampling_rate=SAMPLE_RATE
+    )
+
+    # Shift window-relative samples back to positions in the whole file
+    return [
+        {"start": ts["start"] + start, "end": ts["end"] + start}
+        for ts in timestamps
+    ]
+
+
+def parallel_speech_timestamps(
+    settings,
+    audio_path: str,
+    workers: int,
+    chunk_seconds: float,
+    overlap_seconds: float,
+) -> List:
+    """
+    Run get_speech_timestamps over overlapping PCM windows in a process pool.
+
+    Each window is extended by overlap_seconds on both sides so speech that
+    crosses a boundary is seen whole by at least one worker; the regions
+    are then stitched back into a single sorted list.
+
+    Args:
+        settings: Application settings, used by workers to load the model
+        audio_path: Path to a raw PCM artifact
+        workers: Number of worker processes
+        chunk_seconds: Length of each window before overlap
+        overlap_seconds: Audio added on each side of a window
+
+    Returns:
+        List of speech timestamps in samples
+    """
+    total_samples = len(load_pcm(audio_path))
+    chunk_size = max(int(chunk_seconds * SAMPLE_RATE), VAD_FRAME_SIZE)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+
+    tasks = [
+        (
+            audio_path,
+            max(start - overlap, 0),
+            min(start + chunk_size + overlap, total_samples),
+        )
+        for start in range(0, total_samples, chunk_size)
+    ]
+
+    # Download once here rather than racing inside every worker
+    SileroVAD(settings).ensure_available()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_vad_worker,
+        initargs=(settings,),
+    ) as executor:
+        results = executor.map(_detect_window, tasks)
+
+        return stitch_speech_timestamps(chain.from_iterable(results))
+
+
+def stitch_speech_timestamps(timestamps: Iterable[dict]) -> List:
+    """
+    Merge speech regions found by overlapping windows.
+
+    Regions that overlap or touch are the same speech seen from two
+    windows, so they are collapsed into their union.
+
+    Args:
+        timestamps: Speech timestamps in samples, in any order
+
+    Returns:
+        Sorted, non-overlapping speech timestamps
+    """
+    stitched = []
+
+    for ts in sorted(timestamps, key=lambda item: item["start"]):
+        if stitched and ts["start"] <= stitched[-1]["end"]:
+            stitched[-1]["end"] = max(stitched[-1]["end"], ts["end"])
+        else:
+            stitched.append({"start": ts["start"], "end": ts["end"]})
+
+    return stitched
+
+
+def iter_pcm_windows(
+    audio_path: str, window_size: int, pad: bool = True
+) -> Iterator[np.ndarray]:
+    """
+    Read an audio file as fixed-size 16 kHz mono float32 windows.
+
+    Raw PCM artifacts are read straight from disk; anything else is decoded
+    by an ffmpeg process and read from its stdout pipe. Only one window is
+    held in memory at a time.
+
+    Args:
+        audio_path: Path to the audio file
+        window_size: Number of samples per window
+        pad: Zero-pad the last window to window_size
+
+    Yields:
+        float32 windows, the last one possibly shorter unless padded
+    """
+    if is_pcm_file(audio_path):
+        samples = load_pcm(audio_path)
+
+        for start in range(0, len(samples), window_size):
+            end = start + window_size
+            window = to_float32(samples[start:end])
+            yield _pad_window(window, window_size) if pad else window
+
+        return
+
+    ffmpeg_cmd = decode_command(audio_path)
+
+    process = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE)
+    bytes_per_window = window_size * 2
+
+    try:
+        while True:
+            chunk = process.stdout.read(bytes_per_window)
+            if not chunk:
+                break
+
+            # A truncated trailing byte cannot form a sample
+            chunk = chunk[: len(chunk) - len(chunk) % 2]
+            window = to_float32(np.frombuffer(chunk, dtype=np.int16))
+            yield _pad_window(window, window_size) if pad else window
+    finally:
+        process.stdout.close()
+        process.wait()
+
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, ffmpeg_cmd)
+
+
+def _pad_window(window: np.ndarray, window_size: int) -> np.ndarray:
+    if len(window) == window_size:
+        return window
+
+    return np.pad(window, (0, window_size - len(window)))
+
+
+def stream_speech_timestamps(
+    model,
+    vad_iterator_cls,
+    windows: Iterator[np.ndarray],
+    min_speech_duration_ms: int = 250,
+) -> Iterator[dict]:
+    """
+    Run Silero's per-chunk VAD iterator over a stream of windows.
+
+    Speech regions are yielded as soon as they close, in samples, with the
+    same {"start", "end"} shape get_speech_timestamps returns.
+
+    Args:
+        model: Loaded Silero VAD model
+        vad_iterator_cls: Silero's VADIterator class
+        windows: float32 windows whose size is a multiple of 512 samples
+        min_speech_duration_ms: Regions shorter than this are dropped,
+            matching get_speech_timestamps
+
+    Yields:
+        Speech timestamps in samples
+    """
+    vad_iterator = vad_iterator_cls(model, sampling_rate=SAMPLE_RATE)
+    min_speech_samples = SAMPLE_RATE * min_speech_duration_ms / 1000
+    speech_start = None
+
+    def region(start: int, end: int):
+        if end - start >= min_speech_samples:
+            return {"start": start, "end": end}
+
+        return None
+
+    try:
+        for window in windows:
+            for frame in np.split(window, len(window) // VAD_FRAME_SIZE):
+                event = vad_iterator(torch.from_numpy(frame))
+
+                if not event:
+                    continue
+
+                if "start" in event:
+                    speech_start = int(event["start"])
+                elif speech_start is not None:
+                    speech = region(speech_start, int(event["end"]))
+                    speech_start = None
+
+                    if speech:
+                        yield speech
+
+        # Close a region still open when the audio ends
+        if speech_start is not None:
+            speech = region(speech_start, int(vad_iterator.current_sample))
+
+            if speech:
+                yield speech
+    finally:
+        vad_iterator.reset_states()
@@ -0,0 +1,139 @@
+import os
+from contextlib import ExitStack
+from typing import List
+
+from src.infrastructure.ffmpeg import atomic_output, run_ffmpeg
+from src.infrastructure.media_probe import probe_media
+from src.services.video_editing.proxy import PROXY_OUTPUT_ARGS, is_fresh
+from src.utils import get_file_name
+
+
+class IngestService:
+    """Service decoding each source once into every artifact stages read"""
+
+    def __init__(self, settings, audio_extractor, video_editor):
+        self.settings = settings
+        self.audio_extractor = audio_extractor
+        self.video_editor = video_editor
+
+    def get_thumbnails_dir(self, video_path: str) -> str:
+        return os.path.join(
+            self.settings.output_dir, get_file_name(video_path), "thumbnails"
+        )
+
+    def ingest(self, video_path: str) -> None:
+        """
+        Produce analysis audio, preview proxy and thumbnails in one decode
+
+        Each artifact is written where the stage that uses it looks for it,
+        so extract_audio and the preview render find them cached. Artifacts
+        that already exist are skipped; nothing runs if all of them do.
+
+        Args:
+            video_path: Path to the video file
+        """
+        audio_path = self.audio_extractor.get_audio_path(video_path)
+        thumbnails_dir = self.get_thumbnails_dir(video_path)
+
+        # The proxy only feeds preview renders
+        proxy_path = None
+
+        if self.settings.render_profile == "preview":
+            proxy_path = self.video_editor.get_proxy_path(
+                video_path, self.settings.preview_height
+            )
+
+        need_audio = not os.path.exists(audio_path)
+        need_proxy = proxy_path is not None and not is_fresh(
+            proxy_path, video_path
+        )
+        need_thumbnails = not os.path.isdir(thumbnails_dir)
+
+        if not (need_audio or need_proxy or need_thumbnails):
+            return
+
+        print("    -> Ingesting video...")
+
+        media = probe_media(
+            video_path,
+            os.path.join(self.settings.temp_dir, get_file_name(video_path)),
+        )
+
+        if media.audio_stream is None:
+            raise ValueError(f"Video has no audio stream: {video_path}")
+
+        filters = []
+        outputs = []
+        # Every output is moved in place only once ffmpeg succeeded
+        partial_outputs = ExitStack()
+
+        if need_audio:
+            os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+            outputs += [
+                "-map",
+                "0:a:0",
+                *self.audio_extractor.audio_codec_args,
+                partial_outputs.enter_context(atomic_output(audio_path)),
+            ]
+
+        if need_proxy:
+            filters.append(f"scale=-2:{self.settings.preview_height}[proxy]")
+            outputs += [
+                "-map",
+                "[proxy]",
+                "-map",
+                "0:a:0",
+                *PROXY_OUTPUT_ARGS,
+                partial_outputs.enter_context(atomic_output(proxy_path)),
+            ]
+
+        if need_thumbnails:
+            count = self.settings.thumbnail_count
+            partial_dir = partial_outputs.enter_context(
+                atomic_output(thumbnails_dir)
+            )
+            os.makedirs(partial_dir, exist_ok=True)
+
+            # Spread the thumbnails evenly over the whole video
+            rate = f"{count}/{media.duration}" if media.duration else "1/10"
+            filters.append(
+                f"fps={rate},scale=-2:{self.settings.thumbnail_height}"
+                "[thumbnails]"
+            )
+            outputs += [
+                "-map",
+                "[thumbnails]",
+                "-frames:v",
+                str(count),
+                "-q:v",
+                "3",
+                os.path.join(partial_dir, "thumbnail_%02d.jpg"),
+            ]
+
+        ffmpeg_cmd = [
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            "-i",
+            video_path,
+            *self.build_filter_args(filters),
+            *outputs,
+        ]
+
+        with partial_outputs:
+            run_ffmpeg(ffmpeg_cmd, label="ingest")
+
+        print("      -> Video ingested.")
+
+    @staticmethod
+    def build_filter_args(filters: List[str]) -> List[str]:
+        """Feed one decoded copy of the video to every video output."""
+        if not filters:
+            return []
+
+        labels = [f"[in{i}]" for i in range(len(filters))]
+        graph = [f"[0:v]split={len(filters)}{''.join(labels)}"]
+        graph += [label + chain for label, chain in zip(labels, filters)]
+
+        return ["-filter_complex", ";".join(graph)]
@@ -1,5 +1,6 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Union
 
 from src.services.ai.client import AIClient
@@ -64,21 +65,13 @@ class TextAnalyzerService:
             except json.decoder.JSONDecodeError:
                 pass
 
-        data = {"captions": captions, "segments": segments}
-
-        response = None
+        response_obj = None
 
         try:
-            response = self.ai_service.request(
-                system_prompt=captions_prompt.system_prompt,
-                user_prompt=generate_select_segments_prompt(data),
-                options=dict(
-                    temperature=0.2,
-                    response_format={"type": "json_object"},
-                ),
-            )
-
-            response_obj = json.loads(response)["segments"]
+            if len(segments) <= self.settings.refine_window_segments:
+                response_obj = self.request_refinement(captions, segments)
+            else:
+                response_obj = self.refine_in_windows(captions, segments)
 
             save_to_file(
                 refined_speech_segments_path,
@@ -87,10 +80,172 @@ class TextAnalyzerService:
 
             print("      -> Speech segments refined.")
             return response_obj
-        except json.JSONDecodeError:
-            print(f"    -> Error: AI response is not valid JSON: {response}")
+        except json.JSONDecodeError as e:
+            print(f"    -> Error: AI response is not valid JSON: {e.doc}")
 
             return None
         except Exception as e:
             print(f"    -> Error calling OpenAI API: {str(e)}")
             return None
+
+    def request_refinement(self, captions: str, segments: List) -> List:
+        """
+        Ask the AI which of the segments to keep
+
+        Args:
+            captions: Captions covering the segments
+            segments: List of speech segments
+
+        Returns:
+            List of segments to keep
+        """
+        data = {"captions": captions, "segments": segments}
+
+        response = self.ai_service.request(
+            system_prompt=captions_prompt.system_prompt,
+            user_prompt=generate_select_segments_prompt(data),
+            options=dict(
+                temperature=0.2,
+                response_format={"type": "json_object"},
+            ),
+        )
+
+        return json.loads(response)["segments"]
+
+    def refine_in_windows(self, captions: str, segments: List) -> List:
+        """
+        Refine overlapping windows of segments concurrently and stitch them
+
+        Every window gets the slice of the captions matching its segments,
+        so each response stays well within the completion limit. Overlaps
+        give the AI context on both sides of a window edge; each window
+        only contributes the segments starting in the part it owns.
+
+        Args:
+            captions: Full captions in a string format
+            segments: List of speech segments
+
+        Returns:
+            List of segments to keep, sorted by start
+        """
+        windows = split_windows(
+            len(segments),
+            self.settings.refine_window_segments,
+            self.settings.refine_window_overlap,
+        )
+
+        caption_slices = slice_captions(captions, segments, windows)
+
+        print(f"      -> Refining {len(windows)} windows...")
+
+        with ThreadPoolExecutor(
+            max_workers=self.settings.refine_workers
+        ) as executor:
+            responses = list(
+                executor.map(
+                    lambda args: self.request_refinement(*args),
+                    [
+                        (caption_slice, segments[start:end])
+                        for (start, end, _, _), caption_slice in zip(
+                            windows, caption_slices
+                        )
+                    ],
+                )
+            )
+
+        kept = {}
+
+        for (_, _, owned_start, owned_end), response in zip(
+            windows, responses
+        ):
+            lower = segments[owned_start]["start"]
+            upper = (
+                segments[owned_end]["start"]
+                if owned_end < len(segments)
+                else float("inf")
+            )
+
+            for segment in response:
+                if lower <= segment["start"] < upper:
+                    kept.setdefault(segment["start"], segment)
+
+        return [kept[start] for start in sorted(kept)]
+
+
+def split_windows(count: int, size: int, overlap: int) -> List[tuple]:
+    """
+    Split segment indices into overlapping windows.
+
+    Each window owns the indices from the middle of its overlap with the
+    previous window to the middle of its overlap with the next one, so
+    the owned ranges partition all indices.
+
+    Args:
+        count: Number of segments
+        size: Segments per window
+        overlap: Segments shared by neighbouring windows
+
+    Returns:
+        (start, end, owned_start, owned_end) index ranges
+    """
+    overlap = min(max(overlap, 0), size - 1)
+    step = size - overlap
+
+    starts = list(range(0, max(count - overlap, 1), step))
+    windows = []
+
+    for i, start in enumerate(starts):
+        end = min(start + size, count)
+        owned_start = 0 if i == 0 else start + overlap // 2
+        owned_end = (
+            count if i == len(starts) - 1 else starts[i + 1] + overlap // 2
+        )
+        windows.append((start, end, owned_start, owned_end))
+
+    return windows
+
+
+def slice_captions(
+    captions: str, segments: List, windows: List[tuple]
+) -> List[str]:
+    """
+    Cut the captions into the part matching each window's segments.
+
+    Captions are a cleaned-up version of the segment texts, so positions
+    are mapped proportionally to the segments' text lengths, widened by a
+    tenth of the slice on both sides and snapped to word boundaries.
+
+    Args:
+        captions: Full captions in a string format
+        segments: List of speech segments
+        windows: Windows from split_windows
+
+    Returns:
+        One captions slice per window
+    """
+    lengths = [len(segment["text"]) + 1 for segment in segments]
+    cumulative = [0]
+
+    for length in lengths:
+        cumulative.append(cumulative[-1] + length)
+
+    scale = len(captions) / max(cumulative[-1], 1)
+    slices = []
+
+    for start, end, _, _ in windows:
+        first = cumulative[start] * scale
+        last = cumulative[end] * scale
+        margin = (last - first) / 10
+
+        first = max(int(first - margin), 0)
+        last = min(int(last + margin), len(captions))
+
+        # Widen to whole words
+        while first > 0 and not captions[first - 1].isspace():
+            first -= 1
+        while last < len(captions) and not captions[last].isspace():
+            last += 1
+
+        slices.append(captions[first:last].strip())
+
+    return slices
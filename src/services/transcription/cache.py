@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+# SQLite's default limit on host parameters per statement is 999
+_QUERY_CHUNK = 500
+
+
+class TranscriptionCache:
+    """
+    Persistent transcriptions keyed by the audio of each segment.
+
+    A key hashes the segment's samples together with the recognizer
+    configuration, so identical spans are never sent to ASR twice, even
+    after VAD parameters change or the video's temp folder is removed.
+    """
+
+    def __init__(self, path: str, namespace: dict):
+        self.path = path
+        self.namespace = json.dumps(namespace, sort_keys=True).encode()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS transcriptions ("
+            "key TEXT PRIMARY KEY, text TEXT NOT NULL)"
+        )
+        self.connection.commit()
+
+    def key_for(self, audio: np.ndarray) -> str:
+        digest = hashlib.blake2b(self.namespace, digest_size=20)
+        digest.update(np.ascontiguousarray(audio, dtype=np.float32).data)
+
+        return digest.hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """
+        Look up cached texts, counting hits and misses
+
+        Args:
+            keys: Segment keys from key_for
+
+        Returns:
+            Mapping of the keys found to their text
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self.lock:
+            for start in range(0, len(unique_keys), _QUERY_CHUNK):
+                end = start + _QUERY_CHUNK
+                chunk = unique_keys[start:end]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.connection.execute(
+                    "SELECT key, text FROM transcriptions "
+                    f"WHERE key IN ({placeholders})",
+                    chunk,
+                )
+                found.update(rows)
+
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+
+        return found
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO transcriptions (key, text) "
+                "VALUES (?, ?)",
+                items.items(),
+            )
+            self.connection.commit()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
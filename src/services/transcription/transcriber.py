@@ -1,24 +1,44 @@
 import json
 import os
-import subprocess
-from typing import List
-
-from src.services.ai.speech_recognition import SpeechRecognition
+import queue
+import threading
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from src.core.timeline import Timeline
+from src.services.ai.speech_recognition import create_speech_recognition
+from src.services.audio.pcm import read_pcm, slice_segments, to_float32
+from src.services.transcription.cache import TranscriptionCache
+from src.services.transcription.worker import (
+    WorkerUnavailableError,
+    connect_worker,
+    recognizer_config,
+)
 from src.utils import (
     get_file_name,
-    check_or_create_folder,
     save_to_file,
     read_from_json_file,
 )
 
 
+class TranscriptionError(RuntimeError):
+    """Some speech segments could not be transcribed"""
+
+
 class TranscriptionService:
     """Service for transcribing audio segments"""
 
     def __init__(self, settings):
         self.settings = settings
-        self.folder_path: str = ""
         self.speech_recognition_service = None
+        self.transcription_cache = None
+
+        if settings.transcription_cache_path:
+            self.transcription_cache = TranscriptionCache(
+                settings.transcription_cache_path,
+                namespace=recognizer_config(settings),
+            )
 
     def transcribe(
         self,
@@ -38,116 +58,467 @@ class TranscriptionService:
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-        print("    -> Generating transcription audio files...")
+        print("    -> Transcribing speech segments...")
 
-        file_name = get_file_name(audio_path)
+        speech_segments_file_path = self.get_transcription_path(audio_path)
 
-        temp_audio_path = os.path.join(
-            self.settings.temp_dir, file_name, "audio"
+        cached_segments = self.read_cached_transcription(
+            speech_segments_file_path
         )
 
-        speech_segments_file_path = os.path.join(
-            temp_audio_path, "speech_segments.json"
+        if cached_segments is not None:
+            return cached_segments
+
+        cache_stats = self.get_cache_stats()
+
+        timeline = Timeline.from_segments(speech_segments)
+        samples = read_pcm(audio_path)
+
+        if self.settings.transcription_mode == "long_form":
+            texts = self.transcribe_long_form(samples, timeline)
+        else:
+            texts = self.transcribe_segments(samples, timeline)
+
+        self.print_cache_stats(cache_stats)
+
+        return self.save_transcription(
+            speech_segments_file_path, timeline, texts
         )
 
-        if os.path.exists(speech_segments_file_path):
-            try:
-                speech_segments = read_from_json_file(
-                    file_path=speech_segments_file_path, expected_type=list
-                )
+    def transcribe_stream(
+        self,
+        audio_path: str,
+        speech_segments: Iterator[dict],
+    ) -> List:
+        """
+        Transcribe speech segments while VAD is still producing them
+
+        VAD runs in a background thread and hands segments over through a
+        bounded queue; each time ASR is free it takes whatever is queued,
+        up to one batch. The result and cache file match transcribe().
+
+        Args:
+            audio_path: Path to the audio file
+            speech_segments: Iterator yielding speech segments
+
+        Returns:
+            List containing the full transcription text and segments
+        """
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        speech_segments_file_path = self.get_transcription_path(audio_path)
+
+        if self.settings.transcription_mode == "long_form" or os.path.exists(
+            speech_segments_file_path
+        ):
+            # Long-form needs every segment before it can start
+            return self.transcribe(audio_path, list(speech_segments))
 
-                message = (
-                    "      -> Transcription already generated - "
-                    "using cached version."
+        print("    -> Transcribing speech segments as they are detected...")
+
+        cache_stats = self.get_cache_stats()
+        samples = read_pcm(audio_path)
+
+        segment_queue = queue.Queue(maxsize=self.settings.pipeline_queue_size)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=_produce_segments,
+            args=(speech_segments, segment_queue, stop),
+            daemon=True,
+        )
+        producer.start()
+
+        segments = []
+        texts = []
+
+        try:
+            for batch in _iter_batches(
+                segment_queue, self.settings.asr_batch_size
+            ):
+                texts.extend(
+                    self.transcribe_segments(
+                        samples, Timeline.from_segments(batch)
+                    )
                 )
+                segments.extend(batch)
+        finally:
+            # If ASR failed, VAD must not stay blocked on a full queue
+            stop.set()
+            _drain(segment_queue)
+            producer.join()
 
-                print(message)
+        self.print_cache_stats(cache_stats)
 
-                return speech_segments
-            except json.decoder.JSONDecodeError:
-                pass
+        return self.save_transcription(
+            speech_segments_file_path,
+            Timeline.from_segments(segments),
+            texts,
+        )
 
-        self.folder_path = os.path.join(temp_audio_path, "segments")
+    def transcribe_many(self, jobs: Dict[str, List]) -> Dict[str, List]:
+        """
+        Transcribe several audio files with shared ASR batches
 
-        check_or_create_folder(self.folder_path)
+        Segments of every file go to the recognizer together, so its
+        length buckets fill up even when each video is short; the texts
+        are then split back into each file's speech_segments.json.
 
-        transcribed_segments = []
+        Args:
+            jobs: Speech segments keyed by audio path
 
-        if self.speech_recognition_service is None:
-            self.speech_recognition_service = SpeechRecognition()
-
-        # Process each speech segment
-        audio_segments_path = []
-
-        for i, segment in enumerate(speech_segments):
-            start_time = segment["start"]
-            end_time = segment["end"]
-
-            # Define segment path
-            segment_path = os.path.join(self.folder_path, f"{i}.mp3")
-            audio_segments_path.append(segment_path)
-
-            # Check if segment file already exists
-            if not os.path.exists(segment_path):
-                # Extract the segment audio using ffmpeg
-                # Calculate duration in seconds
-                duration = end_time - start_time
-
-                # Use ffmpeg to extract the segment
-                ffmpeg_cmd = [
-                    "ffmpeg",
-                    "-y",
-                    "-i",
-                    audio_path,
-                    "-ss",
-                    str(start_time),
-                    "-t",
-                    str(duration),
-                    "-acodec",
-                    "libmp3lame",
-                    "-q:a",
-                    "2",
-                    "-loglevel",
-                    "quiet",
-                    segment_path,
-                ]
-
-                subprocess.run(ffmpeg_cmd, check=True)
+        Returns:
+            Transcribed speech segments keyed by audio path
+        """
+        if self.settings.transcription_mode == "long_form":
+            # Whole-file transcription has nothing to share across files
+            return {
+                audio_path: self.transcribe(audio_path, speech_segments)
+                for audio_path, speech_segments in jobs.items()
+            }
 
-        # Transcribe the segments
-        transcription = self.speech_recognition_service.transcribe(
-            audio_segments_path,
+        print(f"    -> Transcribing {len(jobs)} audio files together...")
+
+        results = {}
+        pending = []
+        audio_segments = []
+
+        for audio_path, speech_segments in jobs.items():
+            file_path = self.get_transcription_path(audio_path)
+            cached_segments = self.read_cached_transcription(file_path)
+
+            if cached_segments is not None:
+                results[audio_path] = cached_segments
+                continue
+
+            timeline = Timeline.from_segments(speech_segments)
+            segments = slice_segments(read_pcm(audio_path), timeline)
+
+            pending.append((audio_path, file_path, timeline))
+            audio_segments.extend(segments)
+
+        cache_stats = self.get_cache_stats()
+        texts = self.transcribe_audio_segments(audio_segments)
+        self.print_cache_stats(cache_stats)
+
+        offset = 0
+        failures = []
+
+        for audio_path, file_path, timeline in pending:
+            end = offset + len(timeline)
+
+            try:
+                results[audio_path] = self.save_transcription(
+                    file_path, timeline, texts[offset:end]
+                )
+            except TranscriptionError as e:
+                failures.append(f"{audio_path}: {e}")
+
+            offset = end
+
+        if failures:
+            raise TranscriptionError("\n".join(failures))
+
+        return results
+
+    def get_transcription_path(self, audio_path: str) -> str:
+        file_name = get_file_name(audio_path)
+
+        return os.path.join(
+            self.settings.temp_dir,
+            file_name,
+            "audio",
+            "speech_segments.json",
         )
 
-        if not len(transcription) == len(speech_segments):
-            raise ValueError(
-                "Transcription length does not match speech segments length."
+    @staticmethod
+    def read_cached_transcription(file_path: str) -> Optional[List]:
+        if not os.path.exists(file_path):
+            return None
+
+        try:
+            speech_segments = read_from_json_file(
+                file_path=file_path, expected_type=list
             )
+        except json.decoder.JSONDecodeError:
+            return None
 
-        for i, segment in enumerate(speech_segments):
-            start_time = segment["start"]
-            end_time = segment["end"]
+        message = (
+            "      -> Transcription already generated - using cached version."
+        )
 
-            # Get the transcription result
-            result = transcription[i]
-            segment_text = result["text"].strip()
+        print(message)
 
-            # Add to results
-            if not segment_text:
-                continue
+        return speech_segments
 
-            transcribed_segment = {
-                "start": start_time,
-                "end": end_time,
-                "text": segment_text,
-            }
+    @staticmethod
+    def save_transcription(
+        file_path: str, timeline: Timeline, texts: List[Optional[str]]
+    ) -> List:
+        """
+        Save the transcribed segments of one audio file
+
+        Args:
+            file_path: Where to write speech_segments.json
+            timeline: Speech segments
+            texts: One text per segment, None where recognition failed
 
-            transcribed_segments.append(transcribed_segment)
+        Returns:
+            Segments with recognised speech
+
+        Raises:
+            TranscriptionError: Some segments failed; nothing is saved so a
+                re-run retries them, and only them as the rest are cached
+        """
+        failed = sum(text is None for text in texts)
+
+        if failed:
+            raise TranscriptionError(
+                f"{failed} of {len(texts)} speech segments failed to "
+                "transcribe"
+            )
+
+        # Segments without any recognised speech are dropped
+        has_text = np.array([bool(text) for text in texts], dtype=bool)
+        transcribed_segments = timeline.with_texts(texts)[
+            has_text
+        ].to_segments()
 
         save_to_file(
-            speech_segments_file_path,
+            file_path,
             json.dumps(transcribed_segments, ensure_ascii=False, indent=2),
         )
 
         print("      -> Transcription completed.")
         return transcribed_segments
+
+    def get_cache_stats(self) -> dict:
+        if self.transcription_cache is None:
+            return {}
+
+        return self.transcription_cache.stats()
+
+    def print_cache_stats(self, before: dict) -> None:
+        if self.transcription_cache is None:
+            return
+
+        after = self.transcription_cache.stats()
+        hits = after["hits"] - before["hits"]
+        misses = after["misses"] - before["misses"]
+
+        print(f"      -> Transcription cache: {hits} hits, {misses} misses.")
+
+    def get_speech_recognition(self):
+        """Prefer a warm worker, otherwise load the model in-process."""
+        if self.speech_recognition_service is None:
+            remote = connect_worker(self.settings)
+
+            if remote is not None:
+                print("      -> Using running transcription worker.")
+                self.speech_recognition_service = remote
+            else:
+                self.speech_recognition_service = create_speech_recognition(
+                    self.settings
+                )
+
+        return self.speech_recognition_service
+
+    def recognize(self, method: str, *args) -> List:
+        """
+        Call the recognizer, falling back in-process if the worker drops
+
+        Args:
+            method: "transcribe" or "transcribe_words"
+            *args: Arguments for the recognizer method
+
+        Returns:
+            The recognizer's results
+        """
+        recognizer = self.get_speech_recognition()
+
+        try:
+            return getattr(recognizer, method)(*args)
+        except WorkerUnavailableError as e:
+            print(f"      -> Transcription worker failed ({e}) - local run.")
+
+            self.speech_recognition_service = create_speech_recognition(
+                self.settings
+            )
+
+            return getattr(self.speech_recognition_service, method)(*args)
+
+    def transcribe_segments(
+        self, samples: np.ndarray, timeline: Timeline
+    ) -> List[Optional[str]]:
+        """
+        Transcribe each speech segment on its own
+
+        Args:
+            samples: 16 kHz mono int16 samples of the whole audio
+            timeline: Speech segments
+
+        Returns:
+            One text per segment, None where recognition failed
+        """
+        # Slice the decoded audio in memory, no per-segment files
+        return self.transcribe_audio_segments(
+            slice_segments(samples, timeline)
+        )
+
+    def transcribe_audio_segments(
+        self, audio_segments: List
+    ) -> List[Optional[str]]:
+        """
+        Transcribe audio arrays, skipping spans already in the cache
+
+        Failed recognitions are not cached, so they are retried next time.
+
+        Args:
+            audio_segments: 16 kHz mono float32 arrays
+
+        Returns:
+            One text per array, None where recognition failed
+        """
+        if self.transcription_cache is None:
+            return self.recognize_texts(audio_segments)
+
+        cache = self.transcription_cache
+        keys = [cache.key_for(audio) for audio in audio_segments]
+        cached = cache.get_many(keys)
+
+        # Only spans never heard before go to ASR
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        texts = self.recognize_texts([audio_segments[i] for i in missing])
+
+        new_items = {keys[i]: text for i, text in zip(missing, texts)}
+        cache.put_many(
+            {key: text for key, text in new_items.items() if text is not None}
+        )
+
+        cached.update(new_items)
+
+        return [cached[key] for key in keys]
+
+    def recognize_texts(self, audio_segments: List) -> List[Optional[str]]:
+        if not audio_segments:
+            return []
+
+        # Transcribe the segments
+        transcription = self.recognize("transcribe", audio_segments)
+
+        if not len(transcription) == len(audio_segments):
+            raise ValueError(
+                "Transcription length does not match speech segments length."
+            )
+
+        return [
+            result["text"].strip() if result is not None else None
+            for result in transcription
+        ]
+
+    def transcribe_long_form(
+        self, samples: np.ndarray, timeline: Timeline
+    ) -> List[str]:
+        """
+        Transcribe the whole audio at once and map words onto segments
+
+        Whisper sees full 30 second windows with their context instead of
+        one padded window per short clip; word timestamps then decide which
+        speech segment each word belongs to.
+
+        Args:
+            samples: 16 kHz mono int16 samples of the whole audio
+            timeline: Speech segments
+
+        Returns:
+            One text per segment
+        """
+        words = self.recognize("transcribe_words", to_float32(samples))
+
+        assigned = timeline.assign_words(
+            [word["start"] for word in words],
+            [word["end"] for word in words],
+            [word["text"] for word in words],
+        )
+
+        return [text or "" for text in assigned.texts]
+
+
+# Marks the end of the segment stream in the queue
+_END_OF_STREAM = object()
+
+
+# How often a producer blocked on a full queue checks for a stop request
+_PUT_TIMEOUT = 0.1
+
+
+def _produce_segments(
+    speech_segments: Iterator[dict],
+    segment_queue: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    try:
+        for segment in speech_segments:
+            if not _put(segment_queue, segment, stop):
+                break
+    except Exception as e:
+        # Re-raised by the consumer so VAD errors are not swallowed
+        _put(segment_queue, e, stop)
+    finally:
+        _put(segment_queue, _END_OF_STREAM, stop)
+
+        # Closing the generator runs VAD's cleanup, e.g. stopping the
+        # ffmpeg decoder, when the consumer gave up early
+        close = getattr(speech_segments, "close", None)
+        if close is not None:
+            close()
+
+
+def _put(segment_queue: queue.Queue, item, stop: threading.Event) -> bool:
+    """Queue an item unless the consumer asks to stop first."""
+    while not stop.is_set():
+        try:
+            segment_queue.put(item, timeout=_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+
+    return False
+
+
+def _drain(segment_queue: queue.Queue) -> None:
+    while True:
+        try:
+            segment_queue.get_nowait()
+        except queue.Empty:
+            return
+
+
+def _iter_batches(segment_queue: queue.Queue, batch_size: int):
+    """Yield up to batch_size queued segments, waiting only when empty."""
+    finished = False
+
+    while not finished:
+        batch = []
+        item = segment_queue.get()
+
+        while True:
+            if item is _END_OF_STREAM:
+                finished = True
+                break
+
+            if isinstance(item, Exception):
+                raise item
+
+            batch.append(item)
+
+            if len(batch) >= batch_size:
+                break
+
+            try:
+                item = segment_queue.get_nowait()
+            except queue.Empty:
+                break
+
+        if batch:
+            yield batch
@@ -0,0 +1,237 @@
+"""
+Long-lived transcription worker keeping the ASR model resident.
+
+Run it once per machine:
+
+    python -m src.services.transcription.worker
+
+TranscriptionService sends jobs to it over a Unix socket while it is up
+and falls back to loading the model in-process when it is not.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Header length and payload length, both unsigned 32-bit big-endian
+FRAME = struct.Struct("!II")
+
+
+class WorkerUnavailableError(ConnectionError):
+    """Raised when the worker cannot be reached or drops a job."""
+
+
+def recognizer_config(settings) -> dict:
+    """Settings that must match for the worker's model to be reusable."""
+    return {
+        "backend": settings.asr_backend,
+        "model_size": settings.asr_model_size,
+        "compute_type": settings.asr_compute_type,
+        "language": settings.asr_language,
+    }
+
+
+def send_message(sock: socket.socket, header: dict, payload=b"") -> None:
+    header_bytes = json.dumps(header, default=float).encode("utf-8")
+    payload = bytes(payload)
+
+    sock.sendall(FRAME.pack(len(header_bytes), len(payload)) + header_bytes)
+
+    if payload:
+        sock.sendall(payload)
+
+
+def receive_message(sock: socket.socket) -> Tuple[dict, bytes]:
+    header_size, payload_size = FRAME.unpack(_receive_exact(sock, FRAME.size))
+    header = json.loads(_receive_exact(sock, header_size).decode("utf-8"))
+
+    return header, _receive_exact(sock, payload_size)
+
+
+def _receive_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = bytearray()
+
+    while len(chunks) < size:
+        chunk = sock.recv(min(size - len(chunks), 1 << 20))
+
+        if not chunk:
+            raise WorkerUnavailableError("Worker connection closed.")
+
+        chunks.extend(chunk)
+
+    return bytes(chunks)
+
+
+class RemoteSpeechRecognition:
+    """SpeechRecognizer that forwards jobs to a running worker"""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+
+    def request(self, header: dict, payload=b"", timeout=None) -> dict:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                sock.connect(self.socket_path)
+                send_message(sock, header, payload)
+                response, _ = receive_message(sock)
+        except OSError as e:
+            raise WorkerUnavailableError(str(e)) from e
+
+        if "error" in response:
+            raise WorkerUnavailableError(response["error"])
+
+        return response
+
+    def ping(self) -> dict:
+        return self.request({"op": "ping"}, timeout=1.0)
+
+    def transcribe(self, audio_segments: List) -> List:
+        lengths = [len(audio) for audio in audio_segments]
+        payload = (
+            np.concatenate(audio_segments).astype(np.float32)
+            if audio_segments
+            else np.zeros(0, dtype=np.float32)
+        )
+
+        response = self.request(
+            {"op": "transcribe", "lengths": lengths}, payload.tobytes()
+        )
+
+        return response["results"]
+
+    def transcribe_words(self, audio: np.ndarray) -> List:
+        payload = np.asarray(audio, dtype=np.float32).tobytes()
+        response = self.request({"op": "transcribe_words"}, payload)
+
+        return response["results"]
+
+
+def connect_worker(settings) -> Optional[RemoteSpeechRecognition]:
+    """
+    Get a client for the worker if one is up with the same model
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Worker client, or None to transcribe in-process
+    """
+    socket_path = settings.asr_worker_socket
+
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+
+    remote = RemoteSpeechRecognition(socket_path)
+
+    try:
+        config = remote.ping()["config"]
+    except WorkerUnavailableError:
+        return None
+
+    if config != recognizer_config(settings):
+        print("      -> Transcription worker runs another model - ignoring.")
+        return None
+
+    return remote
+
+
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+
+        try:
+            header, payload = receive_message(self.request)
+        except WorkerUnavailableError:
+            return
+
+        op = header.get("op")
+
+        try:
+            if op == "ping":
+                response = {"config": server.config}
+            elif op == "transcribe":
+                audio = np.frombuffer(payload, dtype=np.float32)
+                bounds = np.cumsum([0] + header["lengths"])
+                segments = [
+                    audio[start:end]
+                    for start, end in zip(bounds[:-1], bounds[1:])
+                ]
+
+                # One model, one job at a time; batching happens inside
+                with server.lock:
+                    results = server.recognizer.transcribe(segments)
+
+                response = {"results": results}
+            elif op == "transcribe_words":
+                audio = np.frombuffer(payload, dtype=np.float32)
+
+                with server.lock:
+                    results = server.recognizer.transcribe_words(audio)
+
+                response = {"results": results}
+            else:
+                response = {"error": f"Unknown operation: {op}"}
+        except Exception as e:
+            response = {"error": str(e)}
+
+        try:
+            send_message(self.request, response)
+        except OSError:
+            # The client went away; nothing left to answer
+            pass
+
+
+class TranscriptionWorker(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, settings, recognizer):
+        self.config = recognizer_config(settings)
+        self.recognizer = recognizer
+        self.lock = threading.Lock()
+
+        socket_path = settings.asr_worker_socket
+
+        os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+
+        # A socket file left by a crashed worker blocks bind()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+        super().__init__(socket_path, _WorkerHandler)
+
+
+def main():
+    from dotenv import load_dotenv
+
+    from src.config.settings import Settings
+    from src.services.ai.speech_recognition import create_speech_recognition
+
+    load_dotenv()
+
+    settings = Settings()
+
+    print(f"Loading {settings.asr_backend} ({settings.asr_model_size})...")
+    recognizer = create_speech_recognition(settings)
+
+    with TranscriptionWorker(settings, recognizer) as worker:
+        print(
+            f"Transcription worker listening on {settings.asr_worker_socket}"
+        )
+
+        try:
+            worker.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(settings.asr_worker_socket)
+
+
+if __name__ == "__main__":
+    main()
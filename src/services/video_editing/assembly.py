@@ -0,0 +1,199 @@
+import json
+import os
+import subprocess
+from typing import List
+
+import numpy as np
+
+from src.core.timeline import Timeline
+from src.infrastructure.ffmpeg import run_ffmpeg
+from src.services.video_editing.filter_graph import build_trim_concat_filter
+from src.services.video_editing.render_profile import RenderProfile
+
+# Decoding starts this long before a re-encoded piece so its first kept
+# frame never sits on the seek point
+SEEK_MARGIN = 1.0
+
+
+class FrameCountError(RuntimeError):
+    """A render assembled from pieces kept the wrong number of frames"""
+
+
+def render_audio(
+    video_path: str,
+    timeline: Timeline,
+    work_dir: str,
+    profile: RenderProfile,
+) -> str:
+    """
+    Render the audio of the whole edit in a single pass.
+
+    Renderers that split the video into pieces keep one continuous audio
+    track so the pieces' frame rounding can't add gaps or clicks. It is cut
+    with atrim/concat whatever the segment count, the only sample-accurate
+    way to cut it.
+
+    Args:
+        video_path: Path to the source video
+        timeline: Segments to keep
+        work_dir: Folder for the filter script and the rendered audio
+        profile: Encoder settings
+
+    Returns:
+        Path to the rendered AAC audio
+    """
+    filter_path = os.path.join(work_dir, "audio_filter.txt")
+    audio_path = os.path.join(work_dir, "audio.m4a")
+
+    with open(filter_path, "w") as f:
+        f.write(build_trim_concat_filter(timeline, video=False))
+
+    run_ffmpeg(
+        [
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            "-i",
+            video_path,
+            "-filter_complex_script",
+            filter_path,
+            "-map",
+            "[outa]",
+            *profile.audio_args(),
+            audio_path,
+        ],
+        label="render_audio",
+    )
+
+    os.remove(filter_path)
+
+    return audio_path
+
+
+def concat_pieces(
+    piece_paths: List[str], audio_path: str, output_path: str, work_dir: str
+) -> None:
+    """
+    Join video pieces and an audio track without re-encoding.
+
+    Args:
+        piece_paths: Video-only pieces in output order
+        audio_path: Audio for the whole edit
+        output_path: Where to write the edited video
+        work_dir: Folder for the concat list
+    """
+    list_path = os.path.join(work_dir, "pieces.txt")
+
+    with open(list_path, "w") as f:
+        for piece_path in piece_paths:
+            f.write(f"file '{os.path.abspath(piece_path)}'\n")
+
+    run_ffmpeg(
+        [
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            list_path,
+            "-i",
+            audio_path,
+            "-map",
+            "0:v:0",
+            "-map",
+            "1:a:0",
+            "-c",
+            "copy",
+            output_path,
+        ],
+        label="concat_pieces",
+    )
+
+    os.remove(list_path)
+
+
+def count_video_frames(video_path: str) -> int:
+    """Count the packets of the first video stream with ffprobe."""
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-count_packets",
+            "-show_entries",
+            "stream=nb_read_packets",
+            "-of",
+            "csv=print_section=0",
+            video_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return int(result.stdout.strip().rstrip(","))
+
+
+def probe_video_stream(video_path: str) -> dict:
+    """Read the coding parameters of the first video stream with ffprobe."""
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=codec_name,profile,pix_fmt,width,height",
+            "-of",
+            "json",
+            video_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    streams = json.loads(result.stdout).get("streams", [])
+
+    return streams[0] if streams else {}
+
+
+def count_kept_frames(timeline: Timeline, frame_times: np.ndarray) -> int:
+    """Number of source frames the trim filters keep for this timeline."""
+    first = np.searchsorted(frame_times, timeline.starts, side="left")
+    last = np.searchsorted(frame_times, timeline.ends, side="left")
+
+    return int(np.sum(last - first))
+
+
+def verify_frame_count(
+    timeline: Timeline, frame_times: np.ndarray, output_path: str
+) -> None:
+    """
+    Check that a render assembled from pieces kept exactly the right frames.
+
+    Args:
+        timeline: Segments to keep
+        frame_times: Sorted source frame times
+        output_path: The rendered video
+
+    Raises:
+        FrameCountError: The output has more or fewer frames than the
+            timeline keeps
+    """
+    expected = count_kept_frames(timeline, frame_times)
+    rendered = count_video_frames(output_path)
+
+    if rendered != expected:
+        raise FrameCountError(
+            f"Render of {output_path} has {rendered} frames, "
+            f"expected {expected}"
+        )
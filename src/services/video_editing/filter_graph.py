@@ -0,0 +1,122 @@
+import numpy as np
+
+from src.core.timeline import Timeline
+
+
+def build_trim_concat_filter(
+    timeline: Timeline, video: bool = True, audio: bool = True
+) -> str:
+    """
+    Build a filter_complex script keeping only the timeline's segments
+
+    Each segment is trimmed out of input 0 and all of them are concatenated
+    into [outv] and/or [outa].
+
+    Args:
+        timeline: Segments to keep
+        video: Include the video stream
+        audio: Include the audio stream
+
+    Returns:
+        filter_complex script
+    """
+    filter_parts = []
+    segment_parts = []
+
+    for i, (start, end) in enumerate(timeline.spans()):
+        segment_label = ""
+
+        if video:
+            # Add a segment trim filter
+            filter_parts.append(
+                f"[0:v]trim=start={start}:end={end},"
+                f"setpts=PTS-STARTPTS[v{i}];"
+            )
+            segment_label += f"[v{i}]"
+
+        if audio:
+            filter_parts.append(
+                f"[0:a]atrim=start={start}:end={end},"
+                f"asetpts=PTS-STARTPTS[a{i}];"
+            )
+            segment_label += f"[a{i}]"
+
+        segment_parts.append(segment_label)
+
+    outputs = ("[outv]" if video else "") + ("[outa]" if audio else "")
+
+    # Concatenate segments
+    filter_parts.append(
+        f"{' '.join(segment_parts)}concat=n={len(timeline)}:"
+        f"v={int(video)}:a={int(audio)}{outputs}"
+    )
+
+    return "".join(filter_parts)
+
+
+def build_select_filter(timeline: Timeline) -> str:
+    """
+    Build a filter_complex script keeping the video segments with select
+
+    Unlike one trim chain per segment, a single select filter holds no
+    per-segment buffers, so memory stays flat however many cuts there are.
+    Frames are kept on the same [start, end) rule trim uses. Each kept
+    frame is shifted back by the time cut before its segment rather than
+    renumbered, so variable frame rate video keeps its timing and every
+    segment starts where the atrim/concat audio puts it.
+
+    Args:
+        timeline: Segments to keep
+
+    Returns:
+        filter_complex script producing [outv]
+    """
+    spans = timeline.spans()
+    kept_before = np.concatenate(([0.0], np.cumsum(timeline.durations)[:-1]))
+    offsets = (timeline.starts - kept_before).tolist()
+
+    selection = "+".join(f"gte(t,{start})*lt(t,{end})" for start, end in spans)
+    shift = "+".join(
+        f"gte(T,{start})*lt(T,{end})*{offset}"
+        for (start, end), offset in zip(spans, offsets)
+    )
+
+    return f"[0:v]select='{selection}',setpts='(T-({shift}))/TB'[outv]"
+
+
+def build_filter(
+    timeline: Timeline,
+    max_concat_segments: int,
+    video: bool = True,
+    audio: bool = True,
+) -> str:
+    """
+    Build the cheapest filter_complex script for the number of segments
+
+    trim/concat buffers every video chain, so past max_concat_segments the
+    video goes through select instead. Audio always uses atrim/concat: its
+    buffers are a fraction of the video's, and cutting it sample-accurately
+    keeps it in sync with the video however many cuts there are.
+
+    Args:
+        timeline: Segments to keep
+        max_concat_segments: Largest segment count whose video is rendered
+            with concat
+        video: Include the video stream
+        audio: Include the audio stream
+
+    Returns:
+        filter_complex script
+    """
+    if len(timeline) <= max_concat_segments:
+        return build_trim_concat_filter(timeline, video=video, audio=audio)
+
+    filter_parts = []
+
+    if video:
+        filter_parts.append(build_select_filter(timeline))
+
+    if audio:
+        filter_parts.append(build_trim_concat_filter(timeline, video=False))
+
+    return ";".join(filter_parts)
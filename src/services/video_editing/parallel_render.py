@@ -0,0 +1,374 @@
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List
+
+import numpy as np
+
+from src.core.timeline import Timeline
+from src.infrastructure.ffmpeg import atomic_output, run_ffmpeg
+from src.infrastructure.media_probe import MediaInfo
+from src.services.video_editing.assembly import (
+    SEEK_MARGIN,
+    concat_pieces,
+    render_audio,
+    verify_frame_count,
+)
+from src.services.video_editing.filter_graph import build_filter
+from src.services.video_editing.render_profile import RenderProfile
+
+
+def frame_aligned_cuts(
+    timeline: Timeline, frame_times: np.ndarray, chunks: int
+) -> np.ndarray:
+    """
+    Pick source times splitting the edit into equal-duration chunks.
+
+    Each cut lies halfway between two source frames, so trimming on either
+    side of it keeps exactly the frames the single-pass render keeps.
+
+    Args:
+        timeline: Segments to keep
+        frame_times: Sorted source frame times
+        chunks: Number of chunks wanted
+
+    Returns:
+        Sorted source cut times, at most chunks - 1 of them
+    """
+    if chunks < 2 or len(frame_times) < 2:
+        return np.empty(0, dtype=np.float64)
+
+    edit_times = np.linspace(0.0, timeline.duration, chunks + 1)[1:-1]
+    targets = timeline.to_source_time(edit_times)
+
+    index = np.searchsorted(frame_times, targets)
+    index = np.clip(index, 1, len(frame_times) - 1)
+    cuts = (frame_times[index - 1] + frame_times[index]) / 2
+
+    return np.unique(cuts)
+
+
+class ParallelRenderer:
+    """Render an edit as equal-duration chunks encoded concurrently"""
+
+    def __init__(self, settings, work_dir: str, profile: RenderProfile):
+        self.settings = settings
+        self.work_dir = work_dir
+        self.profile = profile
+
+    def render(
+        self,
+        video_path: str,
+        media: MediaInfo,
+        timeline: Timeline,
+        output_path: str,
+        on_progress: Callable[[float], None],
+    ) -> bool:
+        """
+        Encode chunks in a pool of ffmpeg processes and join them losslessly
+
+        Chunks are cut between source frames, so together they hold exactly
+        the frames of a single-pass render. Audio is rendered once over the
+        whole edit and the output frame count is checked before returning.
+
+        Args:
+            video_path: Path to the source video
+            media: Probed source metadata, with the frame index
+            timeline: Segments to keep
+            output_path: Where to write the edited video
+            on_progress: Called with the output time reached, in seconds
+
+        Returns:
+            False if the source has no video stream, True once rendered
+        """
+        if media.video_stream is None:
+            return False
+
+        frame_times = media.frame_times
+
+        workers = max(self.settings.render_workers, 1)
+        timeline, chunks = self.split_chunks(timeline, frame_times, workers)
+
+        os.makedirs(self.work_dir, exist_ok=True)
+
+        print(
+            f"      -> Encoding {len(chunks)} chunks with "
+            f"{workers} workers..."
+        )
+
+        chunk_paths = [
+            self.get_chunk_path(video_path, i, chunk)
+            for i, chunk in enumerate(chunks)
+        ]
+        pending = self.get_pending_chunks(chunks, chunk_paths)
+
+        # Chunks already on disk count as done
+        elapsed = sum(chunk.duration for chunk in chunks) - sum(
+            chunk.duration for chunk, _ in pending
+        )
+        on_progress(elapsed)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    self.encode_chunk, video_path, chunk, path
+                ): chunk.duration
+                for chunk, path in pending
+            }
+
+            for future in as_completed(futures):
+                future.result()
+                elapsed += futures[future]
+                on_progress(elapsed)
+
+        audio_path = render_audio(
+            video_path,
+            timeline,
+            self.work_dir,
+            self.profile,
+        )
+
+        concat_pieces(chunk_paths, audio_path, output_path, self.work_dir)
+
+        os.remove(audio_path)
+        self.release_chunks(chunk_paths)
+
+        verify_frame_count(timeline, frame_times, output_path)
+
+        return True
+
+    @staticmethod
+    def split_chunks(
+        timeline: Timeline, frame_times: np.ndarray, workers: int
+    ) -> tuple:
+        """
+        Split the edit into one equal-duration chunk per worker
+
+        Args:
+            timeline: Segments to keep
+            frame_times: Sorted source frame times
+            workers: Number of concurrent encodes
+
+        Returns:
+            The timeline cut at the chunk boundaries and the chunks
+        """
+        cuts = frame_aligned_cuts(timeline, frame_times, workers)
+        timeline = timeline.split(cuts)
+
+        # Chunk i holds the segments starting between cut i - 1 and cut i
+        chunk_ids = np.searchsorted(cuts, timeline.starts, side="right")
+        chunks = [timeline[chunk_ids == i] for i in range(len(cuts) + 1)]
+
+        return timeline, [chunk for chunk in chunks if len(chunk)]
+
+    def get_chunk_path(
+        self, video_path: str, index: int, chunk: Timeline
+    ) -> str:
+        return os.path.join(self.work_dir, f"chunk_{index:03d}.ts")
+
+    def get_pending_chunks(
+        self, chunks: List[Timeline], chunk_paths: List[str]
+    ) -> List[tuple]:
+        """
+        Chunks that have to be encoded, with their paths
+
+        Chunk names only carry their index, so files left by a failed run
+        may hold another cut list or profile; they are removed and every
+        chunk is encoded.
+
+        Args:
+            chunks: Chunks of the edit
+            chunk_paths: Matching output paths
+
+        Returns:
+            (chunk, path) pairs to encode
+        """
+        for pattern in ("chunk_*.ts", "chunk_*_filter.txt"):
+            for path in glob.glob(os.path.join(self.work_dir, pattern)):
+                os.remove(path)
+
+        return list(zip(chunks, chunk_paths))
+
+    @staticmethod
+    def release_chunks(chunk_paths: List[str]) -> None:
+        """Delete the chunk files once the output is muxed."""
+        for path in chunk_paths:
+            os.remove(path)
+
+    def encode_chunk(
+        self, video_path: str, chunk: Timeline, chunk_path: str
+    ) -> None:
+        seek = max(float(chunk.starts[0]) - SEEK_MARGIN, 0.0)
+
+        # select never ends its input, so the input duration is what stops
+        # decoding once the chunk's last segment is past
+        duration = float(chunk.ends[-1]) - seek + SEEK_MARGIN
+
+        # Input seeking restarts timestamps at the seek point
+        shifted = Timeline(chunk.starts - seek, chunk.ends - seek)
+        filter_path = f"{os.path.splitext(chunk_path)[0]}_filter.txt"
+
+        with open(filter_path, "w") as f:
+            f.write(
+                build_filter(
+                    shifted,
+                    self.settings.filter_concat_max_segments,
+                    audio=False,
+                )
+            )
+
+        with atomic_output(chunk_path) as partial_path:
+            run_ffmpeg(
+                [
+                    "ffmpeg",
+                    "-y",
+                    "-loglevel",
+                    "error",
+                    "-ss",
+                    str(seek),
+                    "-t",
+                    str(duration),
+                    "-i",
+                    video_path,
+                    "-filter_complex_script",
+                    filter_path,
+                    "-map",
+                    "[outv]",
+                    "-c:v",
+                    "libx264",
+                    *self.profile.video_args(),
+                    "-threads",
+                    str(self.settings.render_threads_per_worker),
+                    "-f",
+                    "mpegts",
+                    partial_path,
+                ],
+                label="encode_chunk",
+            )
+
+        os.remove(filter_path)
+
+
+class BatchedRenderer(ParallelRenderer):
+    """Render edits with thousands of cuts as bounded sub-renders"""
+
+    def __init__(self, settings, work_dir: str, profile: RenderProfile):
+        super().__init__(settings, work_dir, profile)
+        self.batch_segments = max(settings.filter_batch_segments, 1)
+
+    def split_chunks(
+        self, timeline: Timeline, frame_times: np.ndarray, workers: int
+    ) -> tuple:
+        """
+        Group consecutive segments into batches of filter_batch_segments
+
+        Each sub-render seeks to its first segment, so no process decodes
+        or filters more than one batch worth of the source.
+
+        Args:
+            timeline: Segments to keep
+            frame_times: Sorted source frame times
+            workers: Number of concurrent encodes
+
+        Returns:
+            The unchanged timeline and the batches
+        """
+        size = self.batch_segments
+        chunks = [timeline[i:][:size] for i in range(0, len(timeline), size)]
+
+        return timeline, chunks
+
+
+class IncrementalRenderer(ParallelRenderer):
+    """Render every segment separately and reuse unchanged ones"""
+
+    def __init__(self, settings, work_dir: str, profile: RenderProfile):
+        super().__init__(settings, work_dir, profile)
+        self.cache_dir = settings.render_cache_dir
+
+    def split_chunks(
+        self, timeline: Timeline, frame_times: np.ndarray, workers: int
+    ) -> tuple:
+        """One chunk per segment, so a changed cut re-encodes one chunk."""
+        return timeline, [timeline[i:][:1] for i in range(len(timeline))]
+
+    def get_chunk_path(
+        self, video_path: str, index: int, chunk: Timeline
+    ) -> str:
+        """
+        Cache path of an encoded segment
+
+        The key covers everything that changes the encoded frames: the
+        source file's identity, the segment bounds and the profile.
+
+        Args:
+            video_path: Path to the source video
+            index: Position of the segment in the edit
+            chunk: The single-segment timeline
+
+        Returns:
+            Path inside render_cache_dir
+        """
+        stat = os.stat(video_path)
+        start, end = chunk.spans()[0]
+
+        key = hashlib.blake2b(
+            json.dumps(
+                [
+                    os.path.abspath(video_path),
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    repr(start),
+                    repr(end),
+                    repr(self.profile),
+                ]
+            ).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        return os.path.join(self.cache_dir, f"{key}.ts")
+
+    def get_pending_chunks(
+        self, chunks: List[Timeline], chunk_paths: List[str]
+    ) -> List[tuple]:
+        """Segments without an encode in the cache."""
+        return [
+            (chunk, path)
+            for chunk, path in zip(chunks, chunk_paths)
+            if not os.path.exists(path)
+        ]
+
+    def release_chunks(self, chunk_paths: List[str]) -> None:
+        """
+        Keep the encodes cached and evict the least recently used ones
+
+        Encodes of this render are touched so they are evicted last; the
+        oldest others are removed until the cache fits in
+        render_cache_max_bytes.
+
+        Args:
+            chunk_paths: Encodes used by this render
+        """
+        for path in chunk_paths:
+            os.utime(path)
+
+        in_use = set(chunk_paths)
+        entries = []
+
+        for path in glob.glob(os.path.join(self.cache_dir, "*.ts")):
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.settings.render_cache_max_bytes:
+                break
+
+            if path not in in_use:
+                os.remove(path)
+                total -= size
@@ -0,0 +1,68 @@
+import os
+
+from src.infrastructure.ffmpeg import atomic_output, run_ffmpeg
+
+# Encoding of proxies; a keyframe every half second lets preview renders
+# seek and stream-copy cheaply
+PROXY_OUTPUT_ARGS = [
+    "-c:v",
+    "libx264",
+    "-preset",
+    "ultrafast",
+    "-crf",
+    "23",
+    "-force_key_frames",
+    "expr:gte(t,n_forced*0.5)",
+    "-c:a",
+    "aac",
+    "-b:a",
+    "128k",
+]
+
+
+def is_fresh(artifact_path: str, source_path: str) -> bool:
+    """Whether a derived file exists and is newer than its source."""
+    return os.path.exists(artifact_path) and os.path.getmtime(
+        artifact_path
+    ) >= os.path.getmtime(source_path)
+
+
+def ensure_proxy(video_path: str, proxy_path: str, height: int) -> str:
+    """
+    Create a low-resolution proxy of a video unless a fresh one exists.
+
+    Args:
+        video_path: Path to the source video
+        proxy_path: Where the proxy is cached
+        height: Proxy height in pixels, width follows the aspect ratio
+
+    Returns:
+        Path to the proxy
+    """
+    if is_fresh(proxy_path, video_path):
+        return proxy_path
+
+    print("    -> Creating preview proxy...")
+
+    os.makedirs(os.path.dirname(proxy_path), exist_ok=True)
+
+    with atomic_output(proxy_path) as partial_path:
+        run_ffmpeg(
+            [
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-i",
+                video_path,
+                "-vf",
+                f"scale=-2:{height}",
+                *PROXY_OUTPUT_ARGS,
+                partial_path,
+            ],
+            label="create_proxy",
+        )
+
+    print("      -> Proxy created.")
+
+    return proxy_path
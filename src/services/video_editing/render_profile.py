@@ -0,0 +1,45 @@
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """Encoder settings for one kind of render"""
+
+    name: str
+    crf: int
+    preset: str
+    audio_bitrate: str
+    # Render from a proxy of this height instead of the source
+    proxy_height: Optional[int] = None
+
+    @property
+    def output_prefix(self) -> str:
+        return "edited" if self.name == "final" else self.name
+
+    def video_args(self) -> List[str]:
+        return ["-crf", str(self.crf), "-preset", self.preset]
+
+    def audio_args(self) -> List[str]:
+        return ["-c:a", "aac", "-b:a", self.audio_bitrate]
+
+
+FINAL_PROFILE = RenderProfile(
+    name="final", crf=12, preset="slow", audio_bitrate="320k"
+)
+
+PREVIEW_PROFILE = RenderProfile(
+    name="preview",
+    crf=28,
+    preset="ultrafast",
+    audio_bitrate="96k",
+    proxy_height=360,
+)
+
+
+def get_render_profile(settings) -> RenderProfile:
+    """Profile selected by Settings.render_profile."""
+    if settings.render_profile == "preview":
+        return replace(PREVIEW_PROFILE, proxy_height=settings.preview_height)
+
+    return FINAL_PROFILE
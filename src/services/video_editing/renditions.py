@@ -0,0 +1,142 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+# ffmpeg bitrate values such as "800k", "6M" or "2.5M"
+_BITRATE = re.compile(r"\d+(\.\d+)?[kKmM]?")
+
+
+@dataclass(frozen=True)
+class Rendition:
+    """One output format of the same edit, e.g. 16:9 or vertical 9:16"""
+
+    name: str
+    width: int
+    height: int
+    # Fill the frame by cropping the centre instead of letterboxing
+    crop: bool = False
+    # Peak video bitrate such as "8M"; quality otherwise follows the profile
+    max_bitrate: Optional[str] = None
+
+    def filter_chain(self) -> str:
+        """Scale, then crop or pad, the edited video to this frame size."""
+        size = f"{self.width}:{self.height}"
+
+        if self.crop:
+            chain = (
+                f"scale={size}:force_original_aspect_ratio=increase,"
+                f"crop={size}"
+            )
+        else:
+            chain = (
+                f"scale={size}:force_original_aspect_ratio=decrease,"
+                f"pad={size}:(ow-iw)/2:(oh-ih)/2"
+            )
+
+        return f"{chain},setsar=1"
+
+    def video_args(self) -> List[str]:
+        if self.max_bitrate is None:
+            return []
+
+        return ["-maxrate", self.max_bitrate, "-bufsize", self.max_bitrate]
+
+
+def parse_renditions(spec: str) -> List[Rendition]:
+    """
+    Parse Settings.renditions.
+
+    The format is comma-separated name:WIDTHxHEIGHT[:crop][:bitrate]
+    entries, e.g. "horizontal:1920x1080:8M,vertical:1080x1920:crop:6M".
+
+    Args:
+        spec: Rendition list, empty for no extra outputs
+
+    Returns:
+        Parsed renditions
+
+    Raises:
+        ValueError: An entry is malformed, or two entries share a name
+    """
+    renditions = []
+
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rest = entry.partition(":")
+        size, *options = rest.split(":")
+
+        if not name or any(r.name == name for r in renditions):
+            raise ValueError(f"Missing or repeated rendition name: {entry!r}")
+
+        try:
+            width, height = (int(value) for value in size.split("x"))
+        except ValueError:
+            raise ValueError(f"Invalid rendition size in {entry!r}")
+
+        # 4:2:0 encoders need even, positive frame sizes
+        if width <= 0 or height <= 0 or width % 2 or height % 2:
+            raise ValueError(f"Rendition size must be even in {entry!r}")
+
+        crop = "crop" in options
+        bitrates = [option for option in options if option != "crop"]
+
+        if len(bitrates) > 1 or not all(map(_BITRATE.fullmatch, bitrates)):
+            raise ValueError(f"Invalid rendition options in {entry!r}")
+
+        renditions.append(
+            Rendition(
+                name=name,
+                width=width,
+                height=height,
+                crop=crop,
+                max_bitrate=bitrates[0] if bitrates else None,
+            )
+        )
+
+    return renditions
+
+
+def build_rendition_filter(
+    renditions: Sequence[Rendition], keep_edit: bool = True
+) -> str:
+    """
+    Extend a filter graph ending in [outv]/[outa] with one output each
+
+    The edit is decoded, trimmed and concatenated once; split and asplit
+    hand the result to every rendition, which outputs
+    [rendition_v<i>] and [rendition_a<i>].
+
+    Args:
+        renditions: Output formats
+        keep_edit: Also output the edit itself as [editv]/[edita]
+
+    Returns:
+        Filter script to append after the edit's filter graph
+    """
+    count = len(renditions) + int(keep_edit)
+    edit_v, edit_a = ("[editv]", "[edita]") if keep_edit else ("", "")
+
+    video_inputs = "".join(f"[split_v{i}]" for i in range(len(renditions)))
+    audio_outputs = "".join(
+        f"[rendition_a{i}]" for i in range(len(renditions))
+    )
+
+    filter_parts = [
+        f"[outv]split={count}{edit_v}{video_inputs}",
+        f"[outa]asplit={count}{edit_a}{audio_outputs}",
+    ]
+
+    for i, rendition in enumerate(renditions):
+        filter_parts.append(
+            f"[split_v{i}]{rendition.filter_chain()}[rendition_v{i}]"
+        )
+
+    return ";" + ";".join(filter_parts)
+
+
+def rendition_path(output_path: str, rendition: Rendition) -> str:
+    """Name a rendition after the edit: edited_x.mp4 -> edited_<name>_x.mp4"""
+    directory, file_name = os.path.split(output_path)
+    prefix, _, base_name = file_name.partition("_")
+
+    return os.path.join(directory, f"{prefix}_{rendition.name}_{base_name}")
@@ -0,0 +1,350 @@
+import os
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from src.core.timeline import Timeline
+from src.infrastructure.ffmpeg import run_ffmpeg
+from src.infrastructure.media_probe import MediaInfo
+from src.services.video_editing.assembly import (
+    SEEK_MARGIN,
+    FrameCountError,
+    concat_pieces,
+    probe_video_stream,
+    render_audio,
+    verify_frame_count,
+)
+from src.services.video_editing.render_profile import RenderProfile
+
+# Encoders able to produce pieces that concatenate with stream-copied GOPs
+ENCODERS = {"h264": "libx264", "hevc": "libx265"}
+
+# Encoder profile reproducing each ffprobe profile, so re-encoded pieces
+# share the copied GOPs' SPS constraints
+ENCODER_PROFILES = {
+    "Constrained Baseline": "baseline",
+    "Baseline": "baseline",
+    "Main": "main",
+    "High": "high",
+    "High 10": "high10",
+    "High 4:2:2": "high422",
+    "High 4:4:4 Predictive": "high444",
+    "Main 10": "main10",
+}
+
+# Stream parameters a re-encoded piece must share with the source
+MATCHED_PARAMETERS = ("codec_name", "width", "height", "pix_fmt")
+
+
+@dataclass(frozen=True)
+class Piece:
+    """A part of a kept segment, either stream-copied or re-encoded"""
+
+    start: float
+    end: float
+    copy: bool
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def plan_pieces(
+    timeline: Timeline, keyframes: np.ndarray, min_copy_duration: float
+) -> List[Piece]:
+    """
+    Split every kept segment at its first and last inner keyframe.
+
+    [start, k1) and [k2, end) have to be re-encoded because they don't start
+    on a keyframe; [k1, k2) consists of whole GOPs and is copied as is.
+    Segments without enough whole GOPs are re-encoded entirely.
+
+    Args:
+        timeline: Segments to keep
+        keyframes: Sorted keyframe times of the source video
+        min_copy_duration: Shortest copied run worth splitting a segment for
+
+    Returns:
+        Pieces in output order
+    """
+    pieces = []
+
+    first = np.searchsorted(keyframes, timeline.starts, side="left")
+    last = np.searchsorted(keyframes, timeline.ends, side="right") - 1
+
+    for i, (start, end) in enumerate(timeline.spans()):
+        if first[i] > last[i]:
+            pieces.append(Piece(start, end, copy=False))
+            continue
+
+        copy_start = float(keyframes[first[i]])
+        copy_end = float(keyframes[last[i]])
+
+        if copy_end - copy_start < min_copy_duration:
+            pieces.append(Piece(start, end, copy=False))
+            continue
+
+        if copy_start > start:
+            pieces.append(Piece(start, copy_start, copy=False))
+
+        pieces.append(Piece(copy_start, copy_end, copy=True))
+
+        if end > copy_end:
+            pieces.append(Piece(copy_end, end, copy=False))
+
+    return pieces
+
+
+def trim_bounds(
+    pieces: List[Piece], epsilon: float
+) -> List[Tuple[float, float]]:
+    """
+    Source interval [start, end) each piece keeps.
+
+    Segment edges are kept as they are, like trim does in a single-pass
+    render. Edges on a copy boundary lie on a keyframe whose probed time is
+    rounded, so they move half a frame earlier: the keyframe then always
+    starts the piece after the boundary.
+
+    Args:
+        pieces: Pieces in output order, as planned by plan_pieces
+        epsilon: Half a frame duration
+
+    Returns:
+        One (start, end) pair per piece
+    """
+    bounds = []
+
+    for i, piece in enumerate(pieces):
+        start, end = piece.start, piece.end
+
+        previous = pieces[i - 1] if i > 0 else None
+        following = pieces[i + 1] if i + 1 < len(pieces) else None
+
+        if piece.copy or (
+            previous is not None
+            and previous.copy
+            and previous.end == piece.start
+        ):
+            start -= epsilon
+
+        if piece.copy or (
+            following is not None
+            and following.copy
+            and following.start == piece.end
+        ):
+            end -= epsilon
+
+        bounds.append((start, end))
+
+    return bounds
+
+
+class SmartCutRenderer:
+    """Render an edit by stream-copying whole GOPs between cuts"""
+
+    def __init__(self, settings, work_dir: str, profile: RenderProfile):
+        self.settings = settings
+        self.work_dir = work_dir
+        self.profile = profile
+
+    def render(
+        self,
+        video_path: str,
+        media: MediaInfo,
+        timeline: Timeline,
+        output_path: str,
+        on_progress: Callable[[float], None],
+    ) -> bool:
+        """
+        Render the kept segments, re-encoding only frames next to cuts
+
+        Video pieces are written as MPEG-TS and joined with the concat
+        demuxer; audio is rendered once over the whole edit. The output's
+        frame count is checked against the timeline, since B-frames
+        reordered across a copy boundary can drop frames; on a mismatch
+        the output is discarded so the single-pass render runs instead.
+
+        Args:
+            video_path: Path to the source video
+            media: Probed source metadata, with the frame index
+            timeline: Segments to keep
+            output_path: Where to write the edited video
+            on_progress: Called with the output time reached, in seconds
+
+        Returns:
+            False if the source codec can't be smart-cut, the re-encoded
+            pieces don't match it or the output misses frames, True once
+            rendered
+        """
+        stream = media.video_stream
+
+        if stream is None or stream.get("codec_name") not in ENCODERS:
+            return False
+
+        keyframes = media.keyframe_times
+
+        # Half a frame: nudges seeks onto the intended frame despite the
+        # rounding of pts_time in ffprobe's output
+        epsilon = 0.5 / media.frame_rate
+
+        pieces = plan_pieces(timeline, keyframes, min_copy_duration=1.0)
+        bounds = trim_bounds(pieces, epsilon)
+
+        os.makedirs(self.work_dir, exist_ok=True)
+
+        copied = sum(piece.duration for piece in pieces if piece.copy)
+        print(
+            f"      -> Smart cut: {len(pieces)} pieces, "
+            f"{copied:.1f}s of {timeline.duration:.1f}s stream-copied"
+        )
+
+        piece_paths = []
+        elapsed = 0.0
+        checked = False
+
+        for i, (piece, (start, end)) in enumerate(zip(pieces, bounds)):
+            piece_path = os.path.join(self.work_dir, f"piece_{i:05d}.ts")
+
+            if piece.copy:
+                self.copy_piece(video_path, piece, piece_path, epsilon)
+            else:
+                self.encode_piece(
+                    video_path,
+                    start,
+                    end,
+                    piece_path,
+                    stream,
+                    self.profile,
+                )
+
+            piece_paths.append(piece_path)
+
+            # Every piece is encoded alike, so checking the first will do
+            if not piece.copy and not checked:
+                checked = True
+
+                if not self.matches_source(piece_path, stream):
+                    print(
+                        "      -> Re-encoded pieces don't match the source "
+                        "stream, falling back to a full render"
+                    )
+                    for path in piece_paths:
+                        os.remove(path)
+                    return False
+
+            elapsed += piece.duration
+            on_progress(elapsed)
+
+        audio_path = render_audio(
+            video_path,
+            timeline,
+            self.work_dir,
+            self.profile,
+        )
+
+        concat_pieces(piece_paths, audio_path, output_path, self.work_dir)
+
+        for path in piece_paths + [audio_path]:
+            os.remove(path)
+
+        try:
+            verify_frame_count(timeline, media.frame_times, output_path)
+        except FrameCountError as error:
+            print(f"      -> {error}, falling back to a full render")
+            os.remove(output_path)
+            return False
+
+        return True
+
+    @staticmethod
+    def matches_source(piece_path: str, stream: dict) -> bool:
+        """Whether a re-encoded piece can be decoded with the copied GOPs."""
+        encoded = probe_video_stream(piece_path)
+
+        if any(
+            encoded.get(key) != stream.get(key) for key in MATCHED_PARAMETERS
+        ):
+            return False
+
+        return ENCODER_PROFILES.get(
+            encoded.get("profile")
+        ) == ENCODER_PROFILES.get(stream.get("profile"))
+
+    @staticmethod
+    def copy_piece(
+        video_path: str, piece: Piece, piece_path: str, epsilon: float
+    ) -> None:
+        # Seeking just past the keyframe lands on it, as stream copy starts
+        # at the keyframe before the seek point. -t counts from the seek
+        # point, so taking off epsilon twice stops half a frame before the
+        # next copy boundary and leaves its keyframe to the following piece
+        run_ffmpeg(
+            [
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-ss",
+                str(piece.start + epsilon),
+                "-i",
+                video_path,
+                "-t",
+                str(piece.duration - 2 * epsilon),
+                "-map",
+                "0:v:0",
+                "-c:v",
+                "copy",
+                "-f",
+                "mpegts",
+                piece_path,
+            ],
+            label="copy_piece",
+        )
+
+    @staticmethod
+    def encode_piece(
+        video_path: str,
+        start: float,
+        end: float,
+        piece_path: str,
+        stream: dict,
+        profile: RenderProfile,
+    ) -> None:
+        seek = max(start - SEEK_MARGIN, 0.0)
+
+        # Input seeking restarts timestamps at the seek point; trim then
+        # keeps exactly the frames in [start, end), and the input duration
+        # stops decoding right after them
+        command = [
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            "-ss",
+            str(seek),
+            "-t",
+            str(end - seek + SEEK_MARGIN),
+            "-i",
+            video_path,
+            "-map",
+            "0:v:0",
+            "-vf",
+            f"trim=start={start - seek}:end={end - seek},"
+            "setpts=PTS-STARTPTS",
+            "-c:v",
+            ENCODERS[stream["codec_name"]],
+            *profile.video_args(),
+        ]
+
+        # Match the copied GOPs so decoders don't see a format change
+        if stream.get("pix_fmt"):
+            command += ["-pix_fmt", stream["pix_fmt"]]
+
+        if stream.get("profile") in ENCODER_PROFILES:
+            command += ["-profile:v", ENCODER_PROFILES[stream["profile"]]]
+
+        run_ffmpeg(
+            command + ["-f", "mpegts", piece_path], label="encode_piece"
+        )
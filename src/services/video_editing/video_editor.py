@@ -1,23 +1,55 @@
+import json
 import os
-import re
-import subprocess
-from typing import List
+from typing import List, Optional, Sequence
 
+import numpy as np
 from rich.progress import Progress
 
-from src.utils import get_file_name
+from src.core.timeline import Timeline
+from src.infrastructure.ffmpeg import FFmpegStats, run_ffmpeg
+from src.infrastructure.media_probe import probe_media
+from src.services.video_editing.filter_graph import build_filter
+from src.services.video_editing.parallel_render import (
+    BatchedRenderer,
+    IncrementalRenderer,
+    ParallelRenderer,
+)
+from src.services.video_editing.proxy import ensure_proxy
+from src.services.video_editing.render_profile import (
+    FINAL_PROFILE,
+    RenderProfile,
+    get_render_profile,
+)
+from src.services.video_editing.renditions import (
+    Rendition,
+    build_rendition_filter,
+    parse_renditions,
+    rendition_path,
+)
+from src.services.video_editing.smart_cut import SmartCutRenderer
+from src.utils import get_file_name, read_from_json_file, save_to_file
 
 
 class VideoEditorService:
     """Service for editing video based on selected segments"""
 
+    # Alternatives to the single-pass render, by Settings.render_mode
+    renderers = {
+        "smart_cut": SmartCutRenderer,
+        "parallel": ParallelRenderer,
+        "batched": BatchedRenderer,
+        "incremental": IncrementalRenderer,
+    }
+
     def __init__(self, settings):
         self.settings = settings
+        # Parsed up front so a malformed RENDITIONS fails at startup
+        self.renditions = parse_renditions(settings.renditions)
 
     @staticmethod
     def get_segments_duration(segments: List) -> float:
         """Calculate the total duration of the segments."""
-        return float(sum(seg["end"] - seg["start"] for seg in segments))
+        return Timeline.from_segments(segments).duration
 
     def edit_video(
         self, video_path: str, segments: List, progress_manager: Progress
@@ -25,65 +57,254 @@ class VideoEditorService:
         """
         Edit video to keep only the selected segments
 
+        With the preview profile the edit is rendered quickly from a cached
+        low-resolution proxy; render_final produces the full-quality video
+        from the saved cut list afterwards.
+
         Args:
             video_path: Path to the video file
             segments: List of segments to keep
             progress_manager: Progress manager for updating progress
+        """
+        profile = get_render_profile(self.settings)
+
+        self.save_cut_list(video_path, segments)
+
+        source_path = video_path
+
+        if profile.proxy_height is not None:
+            source_path = ensure_proxy(
+                video_path,
+                self.get_proxy_path(video_path, profile.proxy_height),
+                profile.proxy_height,
+            )
+
+        self.render(
+            video_path, source_path, segments, profile, progress_manager
+        )
+
+    def render_final(
+        self, video_path: str, progress_manager: Progress
+    ) -> None:
+        """
+        Render the saved cut list of a video at full quality
+
+        Args:
+            video_path: Path to the video file
+            progress_manager: Progress manager for updating progress
+        """
+        segments = read_from_json_file(
+            self.get_cut_list_path(video_path), expected_type=list
+        )
+
+        self.render(
+            video_path, video_path, segments, FINAL_PROFILE, progress_manager
+        )
 
-        Returns:
-            Path to the edited video file
+    def render(
+        self,
+        video_path: str,
+        source_path: str,
+        segments: List,
+        profile: RenderProfile,
+        progress_manager: Progress,
+    ) -> None:
+        """
+        Render the segments of source_path with the given profile
+
+        Args:
+            video_path: Path to the original video, used for naming
+            source_path: Video to cut, the original or its proxy
+            segments: List of segments to keep
+            profile: Encoder settings
+            progress_manager: Progress manager for updating progress
         """
-        total_duration = self.get_segments_duration(segments)
+        timeline = Timeline.from_segments(segments)
 
-        if total_duration is None:
-            print("Could not determine video duration.")
-            return
+        render_mode = self.settings.render_mode
+
+        # One filter graph over thousands of cuts doesn't fit in memory
+        if (
+            render_mode == "single"
+            and len(timeline) > self.settings.filter_batch_segments
+        ):
+            render_mode = "batched"
+
+        renderer_cls = self.renderers.get(render_mode)
+
+        # Previews cut a small proxy, so only final renders make renditions
+        renditions = self.renditions if profile.proxy_height is None else []
+
+        # Piece-based renderers cut on the source's frame index
+        media = probe_media(
+            source_path,
+            self.get_temp_dir(video_path),
+            with_packets=renderer_cls is not None,
+        )
+
+        # Cuts past the end of the source would inflate the progress total
+        if media.duration is not None:
+            timeline = timeline.intersect(
+                Timeline(np.array([0.0]), np.array([media.duration]))
+            )
+
+        total_duration = timeline.duration
 
         progress_task = progress_manager.add_task(
-            description="[red]Editing video...",
+            description=f"[red]Rendering {profile.name} video...",
             total=total_duration,
         )
 
-        print("    -> Editing video...")
-
-        file_name = get_file_name(video_path)
-        output_dir = os.path.join(self.settings.output_dir, file_name)
+        print(f"    -> Rendering {profile.name} video...")
 
-        # Ensure output directory exists
-        os.makedirs(output_dir, exist_ok=True)
+        output_dir = self.get_output_dir(video_path)
 
         output_path = os.path.join(
-            output_dir, f"edited_{os.path.basename(video_path)}"
+            output_dir,
+            f"{profile.output_prefix}_{os.path.basename(video_path)}",
         )
 
-        # Create a temporary file for the ffmpeg filter complex script
-        temp_filter_path = os.path.join(output_dir, "filter_script.txt")
+        def on_progress(
+            current_time: float, stats: Optional[FFmpegStats] = None
+        ) -> None:
+            description = f"[red]Rendering {profile.name} video..."
 
-        # Build the filter complex for trimming and concatenating segments
-        filter_parts = []
-        segment_parts = []
+            # Single-pass renders report encoder throughput as they go
+            if stats is not None and stats.speed:
+                description += f" {stats.fps:.0f} fps, {stats.speed:.2f}x"
 
-        for i, seg in enumerate(segments):
-            # Add a segment trim filter
-            filter_parts.append(
-                f"[0:v]trim=start={seg['start']}:end={seg['end']},"
-                f"setpts=PTS-STARTPTS[v{i}];"
+            progress_manager.update(
+                progress_task, completed=current_time, description=description
             )
-            filter_parts.append(
-                f"[0:a]atrim=start={seg['start']}:end={seg['end']},"
-                f"asetpts=PTS-STARTPTS[a{i}];"
+
+        if renderer_cls is not None:
+            renderer = renderer_cls(
+                self.settings, self.get_render_dir(video_path), profile
+            )
+
+            if renderer.render(
+                source_path, media, timeline, output_path, on_progress
+            ):
+                if renditions:
+                    self.render_renditions(
+                        output_path, output_dir, profile, renditions
+                    )
+
+                self.finish_progress(
+                    progress_manager, progress_task, total_duration
+                )
+                return
+
+            print(
+                f"      -> {render_mode} render not possible "
+                "- re-encoding in a single pass."
             )
-            segment_parts.append(f"[v{i}][a{i}]")
 
-        # Concatenate segments
-        filter_parts.append(
-            f"{' '.join(segment_parts)}concat=n={len(segments)}:"
-            f"v=1:a=1[outv][outa]"
+        self.render_single_pass(
+            source_path,
+            timeline,
+            output_path,
+            output_dir,
+            profile,
+            on_progress,
+            renditions,
+        )
+
+        self.finish_progress(progress_manager, progress_task, total_duration)
+
+    def get_output_dir(self, video_path: str) -> str:
+        output_dir = os.path.join(
+            self.settings.output_dir, get_file_name(video_path)
         )
 
+        # Ensure output directory exists
+        os.makedirs(output_dir, exist_ok=True)
+
+        return output_dir
+
+    def get_cut_list_path(self, video_path: str) -> str:
+        return os.path.join(self.get_output_dir(video_path), "cut_list.json")
+
+    def get_proxy_path(self, video_path: str, height: int) -> str:
+        return os.path.join(
+            self.get_temp_dir(video_path), f"proxy_{height}p.mp4"
+        )
+
+    def save_cut_list(self, video_path: str, segments: List) -> None:
+        save_to_file(
+            self.get_cut_list_path(video_path),
+            json.dumps(segments, ensure_ascii=False, indent=2),
+        )
+
+    @staticmethod
+    def finish_progress(progress_manager, progress_task, total_duration):
+        progress_manager.update(
+            progress_task, completed=total_duration, visible=False
+        )
+
+        print("      -> Video edited.")
+
+    def get_temp_dir(self, video_path: str) -> str:
+        return os.path.join(self.settings.temp_dir, get_file_name(video_path))
+
+    def get_render_dir(self, video_path: str) -> str:
+        return os.path.join(self.get_temp_dir(video_path), "render")
+
+    def render_single_pass(
+        self,
+        video_path: str,
+        timeline: Timeline,
+        output_path: str,
+        output_dir: str,
+        profile: RenderProfile,
+        on_progress,
+        renditions: Sequence[Rendition] = (),
+    ) -> None:
+        """
+        Trim, concatenate and re-encode everything in one ffmpeg run
+
+        Args:
+            video_path: Path to the video file
+            timeline: Segments to keep
+            output_path: Where to write the edited video
+            output_dir: Folder for the temporary filter script
+            profile: Encoder settings
+            on_progress: Called with the output time reached, in seconds,
+                and the encoder stats
+            renditions: Extra output formats, each written next to
+                output_path with its name added, from the same decode
+        """
+        # Create a temporary file for the ffmpeg filter complex script
+        temp_filter_path = os.path.join(output_dir, "filter_script.txt")
+
         # Write filter complex to file
         with open(temp_filter_path, "w") as f:
-            f.write("".join(filter_parts))
+            f.write(
+                build_filter(
+                    timeline, self.settings.filter_concat_max_segments
+                )
+            )
+
+        edit_v, edit_a = "[outv]", "[outa]"
+        outputs = []
+
+        if renditions:
+            with open(temp_filter_path, "a") as f:
+                f.write(build_rendition_filter(renditions))
+
+            edit_v, edit_a = "[editv]", "[edita]"
+            outputs = self.rendition_outputs(renditions, output_path, profile)
+
+        outputs = [
+            "-map",
+            edit_v,
+            "-map",
+            edit_a,
+            *profile.video_args(),
+            *profile.audio_args(),
+            output_path,
+            *outputs,
+        ]
 
         # Build and execute ffmpeg command
         ffmpeg_cmd = [
@@ -93,50 +314,82 @@ class VideoEditorService:
             video_path,
             "-filter_complex_script",
             temp_filter_path,
-            "-map",
-            "[outv]",
-            "-map",
-            "[outa]",
-            "-crf",
-            "12",
-            "-preset",
-            "slow",
-            "-c:a",
-            "aac",
-            "-b:a",
-            "320k",
-            output_path,
+            *outputs,
         ]
 
-        time_pattern = re.compile(r'time=(\d+:\d+:\d+\.\d+)')
+        try:
+            run_ffmpeg(
+                ffmpeg_cmd,
+                label="render",
+                on_progress=lambda stats: on_progress(stats.out_time, stats),
+            )
+        finally:
+            # Clean up the temporary filter script
+            if os.path.exists(temp_filter_path):
+                os.remove(temp_filter_path)
 
-        def time_to_seconds(time_str):
-            """Convert hh:mm:ss.ms to seconds."""
-            h, m, s = map(float, time_str.split(":"))
-            return h * 3600 + m * 60 + s
+    def render_renditions(
+        self,
+        edit_path: str,
+        output_dir: str,
+        profile: RenderProfile,
+        renditions: Sequence[Rendition],
+    ) -> None:
+        """
+        Derive the renditions from an edit a piece-based renderer wrote
 
-        process = subprocess.Popen(
-            ffmpeg_cmd,
-            stderr=subprocess.PIPE,
-            text=True,
-            universal_newlines=True,
-            bufsize=1,
-        )
+        The edit is already cut, so this pass only decodes it once more and
+        scales it for every rendition.
 
-        for line in process.stderr:
-            match = time_pattern.search(line)
-            if match:
-                current_time = time_to_seconds(match.group(1))
-                progress_manager.update(progress_task, completed=current_time)
+        Args:
+            edit_path: The rendered edit
+            output_dir: Folder for the temporary filter script
+            profile: Encoder settings
+            renditions: Output formats
+        """
+        print(f"      -> Rendering {len(renditions)} renditions...")
 
-        process.wait()
+        filter_path = os.path.join(output_dir, "rendition_filter.txt")
 
-        # Clean up the temporary filter script
-        if os.path.exists(temp_filter_path):
-            os.remove(temp_filter_path)
+        with open(filter_path, "w") as f:
+            f.write("[0:v]null[outv];[0:a]anull[outa]")
+            f.write(build_rendition_filter(renditions, keep_edit=False))
 
-        progress_manager.update(
-            progress_task, completed=total_duration, visible=False
-        )
+        try:
+            run_ffmpeg(
+                [
+                    "ffmpeg",
+                    "-y",
+                    "-i",
+                    edit_path,
+                    "-filter_complex_script",
+                    filter_path,
+                    *self.rendition_outputs(renditions, edit_path, profile),
+                ],
+                label="render_renditions",
+            )
+        finally:
+            os.remove(filter_path)
 
-        print("      -> Video edited.")
+    @staticmethod
+    def rendition_outputs(
+        renditions: Sequence[Rendition],
+        output_path: str,
+        profile: RenderProfile,
+    ) -> List[str]:
+        """ffmpeg output options writing every rendition next to the edit."""
+        outputs = []
+
+        for i, rendition in enumerate(renditions):
+            outputs += [
+                "-map",
+                f"[rendition_v{i}]",
+                "-map",
+                f"[rendition_a{i}]",
+                *profile.video_args(),
+                *rendition.video_args(),
+                *profile.audio_args(),
+                rendition_path(output_path, rendition),
+            ]
+
+        return outputs
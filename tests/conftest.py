@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from src.core.timeline import Timeline
+
+
+@pytest.fixture
+def make_timeline():
+    """Build a Timeline from (start, end) pairs."""
+
+    def make(*spans):
+        starts = np.array([start for start, _ in spans], dtype=np.float64)
+        ends = np.array([end for _, end in spans], dtype=np.float64)
+
+        return Timeline(starts, ends)
+
+    return make
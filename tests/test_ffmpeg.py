@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from src.infrastructure.ffmpeg import FFmpegStats, atomic_output
+
+
+def test_atomic_output_moves_the_file_in_place(tmp_path):
+    final_path = tmp_path / "audio.pcm"
+
+    with atomic_output(str(final_path)) as partial_path:
+        assert partial_path == str(tmp_path / "audio.partial.pcm")
+        assert not final_path.exists()
+
+        with open(partial_path, "wb") as f:
+            f.write(b"samples")
+
+    assert final_path.read_bytes() == b"samples"
+    assert os.listdir(tmp_path) == ["audio.pcm"]
+
+
+def test_atomic_output_discards_a_failed_file(tmp_path):
+    final_path = tmp_path / "proxy.mp4"
+
+    with pytest.raises(RuntimeError):
+        with atomic_output(str(final_path)) as partial_path:
+            with open(partial_path, "wb") as f:
+                f.write(b"trunc")
+
+            raise RuntimeError("ffmpeg failed")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_atomic_output_discards_a_failed_folder(tmp_path):
+    final_path = tmp_path / "thumbnails"
+
+    with pytest.raises(RuntimeError):
+        with atomic_output(str(final_path)) as partial_dir:
+            os.makedirs(partial_dir)
+            open(os.path.join(partial_dir, "thumbnail_01.jpg"), "wb").close()
+
+            raise RuntimeError("ffmpeg failed")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_stats_parse_progress_lines():
+    stats = FFmpegStats("render")
+    progress = (
+        "frame=1500\nfps=59.94\nbitrate=5012.3kbits/s\n"
+        "total_size=31457280\nout_time_us=50050000\nspeed=2.5x\n"
+        "progress=continue"
+    )
+
+    for line in progress.splitlines():
+        stats.update(*line.split("=", 1))
+
+    assert stats.frames == 1500
+    assert stats.fps == 59.94
+    assert stats.bitrate == "5012.3kbits/s"
+    assert stats.total_size == 31457280
+    assert stats.out_time == 50.05
+    assert stats.speed == 2.5
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [("speed", "N/A"), ("bitrate", "N/A"), ("frame", ""), ("fps", "fast")],
+)
+def test_stats_keep_the_last_value_on_unusable_input(key, value):
+    stats = FFmpegStats(
+        "render", frames=12, fps=30.0, speed=1.5, bitrate="900kbits/s"
+    )
+
+    stats.update(key, value)
+
+    assert (stats.frames, stats.fps, stats.speed, stats.bitrate) == (
+        12,
+        30.0,
+        1.5,
+        "900kbits/s",
+    )
+
+
+def test_stats_clamp_negative_out_time():
+    stats = FFmpegStats("render")
+
+    stats.update("out_time_us", "-23220")
+
+    assert stats.out_time == 0.0
@@ -0,0 +1,31 @@
+from src.services.video_editing.filter_graph import (
+    build_filter,
+    build_select_filter,
+)
+
+
+def test_select_shifts_segments_by_the_time_cut_before_them(make_timeline):
+    script = build_select_filter(make_timeline((1, 2), (5, 7.5)))
+
+    assert "setpts='(T-(gte(T,1.0)*lt(T,2.0)*1.0" in script
+    assert "+gte(T,5.0)*lt(T,7.5)*4.0))/TB'[outv]" in script
+    assert "FRAME_RATE" not in script
+
+
+def test_audio_stays_on_atrim_past_the_concat_limit(make_timeline):
+    script = build_filter(
+        make_timeline((1, 2), (5, 7.5)), max_concat_segments=1
+    )
+
+    assert "[0:v]select=" in script
+    assert "aselect" not in script
+    assert "[a0] [a1]concat=n=2:v=0:a=1[outa]" in script
+
+
+def test_concat_within_the_limit(make_timeline):
+    script = build_filter(
+        make_timeline((1, 2), (5, 7.5)), max_concat_segments=2
+    )
+
+    assert "select" not in script
+    assert "concat=n=2:v=1:a=1[outv][outa]" in script
@@ -0,0 +1,69 @@
+import json
+import subprocess
+
+import numpy as np
+
+from src.infrastructure import media_probe
+
+METADATA = {
+    "format": {"duration": "10.0", "start_time": "1.000000"},
+    "streams": [
+        {"codec_type": "audio", "start_time": "1.000000"},
+        {
+            "codec_type": "video",
+            "start_time": "1.500000",
+            "avg_frame_rate": "2/1",
+        },
+    ],
+}
+
+# Decode order: the B-frame at 2.0 comes after the P-frame at 2.5
+PACKETS = "1.500000,K__\n2.500000,___\n2.000000,___\n3.000000,K__\n"
+
+
+def fake_ffprobe(command, **kwargs):
+    if "packet=pts_time,flags" in command:
+        stdout = PACKETS
+    else:
+        stdout = json.dumps(METADATA)
+
+    return subprocess.CompletedProcess(command, 0, stdout=stdout)
+
+
+def test_frame_times_are_relative_to_the_container_start(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(media_probe.subprocess, "run", fake_ffprobe)
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_bytes(b"video")
+
+    info = media_probe.probe_media(
+        str(video_path), str(tmp_path), with_packets=True
+    )
+
+    assert info.start_time == 1.0
+    assert info.frame_times.tolist() == [0.5, 1.0, 1.5, 2.0]
+    assert info.keyframe_times.tolist() == [0.5, 2.0]
+    assert info.frame_rate == 2.0
+
+
+def test_probe_is_cached_until_the_file_changes(tmp_path, monkeypatch):
+    calls = []
+
+    def counting_ffprobe(command, **kwargs):
+        calls.append(command)
+        return fake_ffprobe(command, **kwargs)
+
+    monkeypatch.setattr(media_probe.subprocess, "run", counting_ffprobe)
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_bytes(b"video")
+
+    media_probe.probe_media(str(video_path), str(tmp_path), True)
+    media_probe.probe_media(str(video_path), str(tmp_path), True)
+    assert len(calls) == 2
+
+    video_path.write_bytes(b"longer video")
+    info = media_probe.probe_media(str(video_path), str(tmp_path), True)
+
+    assert len(calls) == 4
+    assert isinstance(info.frame_times, np.ndarray)
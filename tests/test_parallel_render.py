@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.core.timeline import Timeline
+from src.services.video_editing.assembly import count_kept_frames
+from src.services.video_editing.parallel_render import (
+    BatchedRenderer,
+    ParallelRenderer,
+    frame_aligned_cuts,
+)
+
+
+def random_timeline(rng, duration, segments):
+    edges = np.sort(rng.uniform(0, duration, 2 * segments))
+
+    return Timeline(edges[0::2], edges[1::2])
+
+
+def test_chunks_keep_the_single_pass_frames():
+    rng = np.random.default_rng(0)
+
+    for _ in range(200):
+        steps = rng.uniform(0.9, 1.1, 3000) / 30
+        frame_times = np.concatenate(([0.0], np.cumsum(steps)[:-1]))
+        timeline = random_timeline(
+            rng, frame_times[-1], int(rng.integers(1, 30))
+        )
+        workers = int(rng.integers(1, 9))
+
+        _, chunks = ParallelRenderer.split_chunks(
+            timeline, frame_times, workers
+        )
+
+        assert 1 <= len(chunks) <= workers
+        assert sum(
+            count_kept_frames(chunk, frame_times) for chunk in chunks
+        ) == count_kept_frames(timeline, frame_times)
+
+
+def test_chunks_are_ordered_and_equal_length():
+    frame_times = np.arange(0, 100, 0.04)
+    timeline = Timeline(np.array([0.0, 50.0]), np.array([30.0, 60.0]))
+
+    split, chunks = ParallelRenderer.split_chunks(timeline, frame_times, 4)
+
+    assert split.duration == timeline.duration
+    durations = [chunk.duration for chunk in chunks]
+    assert np.allclose(durations, 10, atol=0.04)
+    for before, after in zip(chunks, chunks[1:]):
+        assert before.ends[-1] <= after.starts[0]
+
+
+def test_cuts_fall_between_frames():
+    frame_times = np.arange(0, 10, 0.04)
+    timeline = Timeline(np.array([0.0]), np.array([10.0]))
+
+    cuts = frame_aligned_cuts(timeline, frame_times, 3)
+
+    assert len(cuts) == 2
+    offsets = (cuts - frame_times[0]) / 0.04 % 1
+    assert np.allclose(offsets, 0.5)
+
+
+def test_single_worker_has_no_cuts():
+    frame_times = np.arange(0, 10, 0.04)
+    timeline = Timeline(np.array([1.0]), np.array([5.0]))
+
+    assert len(frame_aligned_cuts(timeline, frame_times, 1)) == 0
+
+
+def test_batches_hold_consecutive_segments(tmp_path, make_timeline):
+    settings = SimpleNamespace(filter_batch_segments=2)
+    renderer = BatchedRenderer(settings, str(tmp_path), profile=None)
+    timeline = make_timeline((0, 1), (2, 3), (4, 5), (6, 7), (8, 9))
+
+    split, batches = renderer.split_chunks(timeline, np.arange(10.0), 4)
+
+    assert split is timeline
+    assert [batch.spans() for batch in batches] == [
+        [(0, 1), (2, 3)],
+        [(4, 5), (6, 7)],
+        [(8, 9)],
+    ]
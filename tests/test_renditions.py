@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from src.services.video_editing.renditions import (
+    Rendition,
+    build_rendition_filter,
+    parse_renditions,
+    rendition_path,
+)
+
+
+def test_parse_renditions():
+    renditions = parse_renditions(
+        "horizontal:1920x1080:8M, vertical:1080x1920:crop:6M,"
+    )
+
+    assert renditions == [
+        Rendition("horizontal", 1920, 1080, crop=False, max_bitrate="8M"),
+        Rendition("vertical", 1080, 1920, crop=True, max_bitrate="6M"),
+    ]
+
+
+def test_empty_spec_has_no_renditions():
+    assert parse_renditions("") == []
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        "wide:1920by1080",
+        ":1280x720",
+        "a:1280x720,a:640x360",
+        "odd:1279x720",
+        "zero:0x720",
+        "fast:1280x720:quick",
+        "two:1280x720:4M:6M",
+    ],
+)
+def test_malformed_renditions_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_renditions(spec)
+
+
+def test_rendition_filter_keeps_the_edit():
+    script = build_rendition_filter(parse_renditions("v:1080x1920:crop"))
+
+    assert "[outv]split=2[editv][split_v0]" in script
+    assert "[outa]asplit=2[edita][rendition_a0]" in script
+    assert "crop=1080:1920" in script
+
+
+def test_rendition_filter_without_the_edit():
+    script = build_rendition_filter(
+        parse_renditions("a:1280x720,b:640x360"), keep_edit=False
+    )
+
+    assert "[outv]split=2[split_v0][split_v1]" in script
+    assert "[outa]asplit=2[rendition_a0][rendition_a1]" in script
+
+
+def test_rendition_path_is_named_after_the_edit():
+    rendition = Rendition("vertical", 1080, 1920)
+    output_path = os.path.join("out", "talk", "edited_talk.mp4")
+
+    assert rendition_path(output_path, rendition) == os.path.join(
+        "out", "talk", "edited_vertical_talk.mp4"
+    )
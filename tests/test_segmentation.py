@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+from src.services.audio.segmentation import (  # noqa: E402
+    FRAME_SECONDS,
+    SegmentationParams,
+    speech_regions,
+)
+
+EXACT = SegmentationParams(
+    min_speech_duration_ms=0, min_silence_duration_ms=0, speech_pad_ms=0
+)
+
+
+def frames(starts, ends):
+    return np.round(starts / FRAME_SECONDS), np.round(ends / FRAME_SECONDS)
+
+
+def test_speech_lasts_until_the_end_threshold():
+    probabilities = np.array([0.1, 0.4, 0.6, 0.4, 0.36, 0.2, 0.9, 0.1])
+
+    starts, ends = frames(*speech_regions(probabilities, EXACT))
+
+    assert starts.tolist() == [2, 6]
+    assert ends.tolist() == [5, 7]
+
+
+def test_runs_that_never_reach_the_threshold_are_not_speech():
+    probabilities = np.array([0.1, 0.4, 0.45, 0.4, 0.1])
+
+    starts, ends = speech_regions(probabilities, EXACT)
+
+    assert len(starts) == len(ends) == 0
+
+
+def test_explicit_neg_threshold():
+    probabilities = np.array([0.6, 0.4, 0.1])
+    params = SegmentationParams(
+        neg_threshold=0.45,
+        min_speech_duration_ms=0,
+        min_silence_duration_ms=0,
+        speech_pad_ms=0,
+    )
+
+    starts, ends = frames(*speech_regions(probabilities, params))
+
+    assert ends.tolist() == [1]
@@ -0,0 +1,76 @@
+import numpy as np
+
+from src.core.timeline import Timeline
+from src.services.video_editing.assembly import count_kept_frames
+from src.services.video_editing.smart_cut import plan_pieces, trim_bounds
+
+
+def random_source(rng, frames=3000, gop=48):
+    """Jittered ~30 fps frame times, as ffprobe prints them, and keyframes."""
+    steps = rng.uniform(0.9, 1.1, frames) / 30
+    true_times = np.concatenate(([0.0], np.cumsum(steps)[:-1]))
+    probed_times = np.round(true_times, 6)
+    keyframes = np.zeros(frames, dtype=bool)
+    keyframes[::gop] = True
+
+    return true_times, probed_times, keyframes
+
+
+def random_timeline(rng, duration, segments):
+    edges = np.sort(rng.uniform(0, duration, 2 * segments))
+
+    return Timeline(edges[0::2], edges[1::2])
+
+
+def test_pieces_keep_the_single_pass_frames():
+    rng = np.random.default_rng(0)
+
+    for _ in range(300):
+        true_times, probed_times, keyframes = random_source(rng)
+        timeline = random_timeline(
+            rng, true_times[-1], int(rng.integers(1, 20))
+        )
+        epsilon = 0.5 / 30
+
+        pieces = plan_pieces(timeline, probed_times[keyframes], 1.0)
+        bounds = np.array(trim_bounds(pieces, epsilon)).reshape(-1, 2)
+
+        kept = np.searchsorted(true_times, bounds[:, 1]) - np.searchsorted(
+            true_times, bounds[:, 0]
+        )
+
+        assert kept.sum() == count_kept_frames(timeline, probed_times)
+
+
+def test_copied_pieces_start_and_end_on_keyframes():
+    keyframes = np.array([0.0, 2.0, 4.0, 6.0])
+    timeline = Timeline(np.array([0.5]), np.array([5.5]))
+
+    pieces = plan_pieces(timeline, keyframes, min_copy_duration=1.0)
+
+    assert [(p.start, p.end, p.copy) for p in pieces] == [
+        (0.5, 2.0, False),
+        (2.0, 4.0, True),
+        (4.0, 5.5, False),
+    ]
+
+
+def test_short_segments_are_re_encoded_whole():
+    keyframes = np.array([0.0, 2.0, 4.0])
+    timeline = Timeline(np.array([1.5]), np.array([2.5]))
+
+    pieces = plan_pieces(timeline, keyframes, min_copy_duration=1.0)
+
+    assert [(p.start, p.end, p.copy) for p in pieces] == [(1.5, 2.5, False)]
+
+
+def test_only_copy_boundaries_move_by_epsilon():
+    keyframes = np.array([0.0, 2.0, 4.0, 6.0])
+    timeline = Timeline(np.array([0.5]), np.array([5.5]))
+    pieces = plan_pieces(timeline, keyframes, min_copy_duration=1.0)
+
+    assert trim_bounds(pieces, 0.1) == [
+        (0.5, 1.9),
+        (1.9, 3.9),
+        (3.9, 5.5),
+    ]
@@ -0,0 +1,53 @@
+import pytest
+
+from src.services.text_analysis.text_analyzer import (
+    slice_captions,
+    split_windows,
+)
+
+
+@pytest.mark.parametrize(
+    "count, size, overlap",
+    [(1, 4, 2), (10, 4, 2), (37, 8, 3), (100, 10, 0), (50, 5, 9)],
+)
+def test_owned_ranges_partition_the_segments(count, size, overlap):
+    windows = split_windows(count, size, overlap)
+
+    owned = [
+        index
+        for _, _, owned_start, owned_end in windows
+        for index in range(owned_start, owned_end)
+    ]
+
+    assert owned == list(range(count))
+    for start, end, owned_start, owned_end in windows:
+        assert start <= owned_start <= owned_end <= end
+        assert end - start <= size
+
+
+def test_windows_overlap_their_neighbours():
+    assert split_windows(10, 4, 2) == [
+        (0, 4, 0, 3),
+        (2, 6, 3, 5),
+        (4, 8, 5, 7),
+        (6, 10, 7, 10),
+    ]
+
+
+def test_short_transcripts_fit_one_window():
+    assert split_windows(3, 4, 2) == [(0, 3, 0, 3)]
+
+
+def test_caption_slices_cover_their_window_in_whole_words():
+    segments = [{"text": f"word{i} " * 5} for i in range(20)]
+    captions = " ".join(segment["text"].strip() for segment in segments)
+    windows = split_windows(len(segments), 5, 2)
+
+    slices = slice_captions(captions, segments, windows)
+
+    assert len(slices) == len(windows)
+    for (start, end, _, _), text in zip(windows, slices):
+        words = text.split()
+        assert set(words) <= set(captions.split())
+        assert f"word{start}" in words
+        assert f"word{end - 1}" in words
@@ -0,0 +1,44 @@
+import numpy as np
+
+from src.core.timeline import Timeline
+
+
+def test_intersect_keeps_covered_parts(make_timeline):
+    result = make_timeline((0, 4), (6, 10)).intersect(make_timeline((2, 8)))
+
+    assert result.spans() == [(2.0, 4.0), (6.0, 8.0)]
+
+
+def test_subtract_removes_covered_parts(make_timeline):
+    result = make_timeline((0, 4), (6, 10)).subtract(make_timeline((2, 8)))
+
+    assert result.spans() == [(0.0, 2.0), (8.0, 10.0)]
+
+
+def test_disjoint_intersect_is_empty(make_timeline):
+    result = make_timeline((0, 1), (2, 3)).intersect(make_timeline((5, 6)))
+
+    assert len(result) == 0
+    assert result.duration == 0
+
+
+def test_subtract_everything_is_empty(make_timeline):
+    result = make_timeline((1, 2), (3, 4)).subtract(make_timeline((0, 5)))
+
+    assert len(result) == 0
+
+
+def test_overlay_of_empty_timeline_is_empty(make_timeline):
+    empty = make_timeline()
+
+    assert len(empty.intersect(make_timeline((0, 5)))) == 0
+    assert len(empty.subtract(make_timeline((0, 5)))) == 0
+    assert len(make_timeline((0, 5)).intersect(empty)) == 0
+
+
+def test_empty_result_keeps_texts_array(make_timeline):
+    source = Timeline(np.array([0.0]), np.array([1.0]), texts=["a"])
+    result = source.intersect(make_timeline((2, 3)))
+
+    assert len(result) == 0
+    assert result.texts is not None and len(result.texts) == 0
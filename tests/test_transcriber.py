@@ -0,0 +1,104 @@
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("transformers")
+
+from src.services.transcription.transcriber import (  # noqa: E402
+    TranscriptionError,
+    TranscriptionService,
+)
+
+
+class FlakyRecognizer:
+    """Fails on segments whose first sample is negative"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio_segments):
+        self.calls += len(audio_segments)
+
+        return [
+            None if audio[0] < 0 else {"text": f" {len(audio)} "}
+            for audio in audio_segments
+        ]
+
+
+@pytest.fixture
+def service(tmp_path):
+    settings = SimpleNamespace(
+        transcription_cache_path=str(tmp_path / "cache.sqlite"),
+        asr_backend="transformers",
+        asr_model_size="tiny",
+        asr_compute_type="int8",
+        asr_language="pt",
+        temp_dir=str(tmp_path / "temp"),
+        transcription_mode="segments",
+        pipeline_queue_size=1,
+        asr_batch_size=1,
+    )
+    service = TranscriptionService(settings)
+    service.speech_recognition_service = FlakyRecognizer()
+
+    return service
+
+
+def test_failed_segments_are_not_cached(service):
+    good = np.ones(10, dtype=np.float32)
+    bad = -np.ones(20, dtype=np.float32)
+
+    assert service.transcribe_audio_segments([good, bad]) == ["10", None]
+    assert service.transcribe_audio_segments([good, bad]) == ["10", None]
+
+    # The good segment was recognized once, the failed one every time
+    assert service.speech_recognition_service.calls == 3
+
+
+def test_failed_segments_are_reported_not_dropped(tmp_path, make_timeline):
+    file_path = tmp_path / "speech_segments.json"
+    timeline = make_timeline((0, 1), (2, 3))
+
+    with pytest.raises(TranscriptionError, match="1 of 2"):
+        TranscriptionService.save_transcription(
+            str(file_path), timeline, ["hello", None]
+        )
+
+    assert not file_path.exists()
+
+
+def test_empty_texts_are_dropped(tmp_path, make_timeline):
+    file_path = tmp_path / "speech_segments.json"
+    timeline = make_timeline((0, 1), (2, 3))
+
+    segments = TranscriptionService.save_transcription(
+        str(file_path), timeline, ["hello", ""]
+    )
+
+    assert segments == [{"start": 0.0, "end": 1.0, "text": "hello"}]
+
+
+def test_failed_stream_stops_and_closes_vad(service, tmp_path, monkeypatch):
+    audio_path = tmp_path / "audio.pcm"
+    audio_path.write_bytes(np.zeros(16000, dtype=np.int16).tobytes())
+    closed = threading.Event()
+
+    def speech_segments():
+        try:
+            for i in range(1000):
+                yield {"start": i / 1000, "end": (i + 1) / 1000}
+        finally:
+            closed.set()
+
+    def fail(samples, timeline):
+        raise RuntimeError("CUDA out of memory")
+
+    monkeypatch.setattr(service, "transcribe_segments", fail)
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        service.transcribe_stream(str(audio_path), speech_segments())
+
+    assert closed.is_set()
+    assert threading.active_count() == 1
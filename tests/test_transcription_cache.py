@@ -0,0 +1,49 @@
+import numpy as np
+
+from src.services.transcription.cache import TranscriptionCache
+
+NAMESPACE = {"backend": "transformers", "model_size": "large-v3"}
+
+
+def test_texts_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache" / "transcriptions.sqlite")
+    audio = np.linspace(-1, 1, 1600, dtype=np.float32)
+
+    cache = TranscriptionCache(path, NAMESPACE)
+    key = cache.key_for(audio)
+    cache.put_many({key: "olá"})
+
+    reopened = TranscriptionCache(path, NAMESPACE)
+
+    assert reopened.get_many([key]) == {key: "olá"}
+
+
+def test_keys_depend_on_audio_and_recognizer(tmp_path):
+    path = str(tmp_path / "transcriptions.sqlite")
+    audio = np.zeros(1600, dtype=np.float32)
+
+    cache = TranscriptionCache(path, NAMESPACE)
+    other_model = TranscriptionCache(path, {**NAMESPACE, "model_size": "s"})
+
+    assert cache.key_for(audio) == cache.key_for(audio.copy())
+    assert cache.key_for(audio) != cache.key_for(audio[:800])
+    assert cache.key_for(audio) != other_model.key_for(audio)
+
+
+def test_lookups_count_hits_and_misses(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / "t.sqlite"), NAMESPACE)
+    keys = [cache.key_for(np.full(10, i, dtype=np.float32)) for i in range(3)]
+    cache.put_many({keys[0]: "a"})
+
+    found = cache.get_many([keys[0], keys[1], keys[0], keys[2]])
+
+    assert found == {keys[0]: "a"}
+    assert cache.stats() == {"hits": 2, "misses": 2}
+
+
+def test_lookups_past_the_sqlite_parameter_limit(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / "t.sqlite"), NAMESPACE)
+    items = {f"key-{i}": f"text {i}" for i in range(1200)}
+    cache.put_many(items)
+
+    assert cache.get_many(list(items)) == items
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+from src.services.audio.vad import (  # noqa: E402
+    iter_pcm_windows,
+    stitch_speech_timestamps,
+)
+
+
+def test_stitch_merges_regions_seen_by_two_windows():
+    timestamps = [
+        {"start": 900, "end": 1500},
+        {"start": 100, "end": 400},
+        {"start": 1200, "end": 1400},
+        {"start": 400, "end": 600},
+        {"start": 2000, "end": 2100},
+    ]
+
+    assert stitch_speech_timestamps(timestamps) == [
+        {"start": 100, "end": 600},
+        {"start": 900, "end": 1500},
+        {"start": 2000, "end": 2100},
+    ]
+
+
+def test_stitch_of_nothing_is_empty():
+    assert stitch_speech_timestamps([]) == []
+
+
+def test_stitch_leaves_its_input_untouched():
+    timestamps = [{"start": 0, "end": 10}, {"start": 5, "end": 20}]
+
+    stitch_speech_timestamps(timestamps)
+
+    assert timestamps == [{"start": 0, "end": 10}, {"start": 5, "end": 20}]
+
+
+@pytest.mark.parametrize("pad", [True, False])
+def test_pcm_windows_cover_the_audio(tmp_path, pad):
+    audio_path = tmp_path / "audio.pcm"
+    samples = np.arange(1, 1201, dtype=np.int16)
+    audio_path.write_bytes(samples.tobytes())
+
+    windows = list(iter_pcm_windows(str(audio_path), 512, pad=pad))
+
+    assert [len(window) for window in windows] == (
+        [512, 512, 512] if pad else [512, 512, 176]
+    )
+    assert np.concatenate(windows)[:1200] * 32768 == pytest.approx(samples)